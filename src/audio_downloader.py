@@ -1,18 +1,41 @@
 """yt-dlp wrapper for audio and caption extraction."""
 
+import asyncio
 import logging
 import os
 import json
+import shutil
 import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List
-import yt_dlp
+from types import MappingProxyType
+from typing import Optional, List, Tuple, Union
+
+from .url_parser import URLParser
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of video metadata entries kept in memory
+INFO_CACHE_SIZE = 1000
+
+# Base filename for everything yt-dlp writes into a video's temp directory
+OUTPUT_NAME = "media"
+
+
+@cache
+def _yt_dlp():
+    """Import yt-dlp on first use; it loads hundreds of extractor modules."""
+    import yt_dlp
 
-@dataclass
+    return yt_dlp
+
+
+@dataclass(slots=True, frozen=True)
 class DownloadResult:
     """Result of a video download operation."""
 
@@ -36,6 +59,9 @@ class AudioDownloader:
         temp_dir: str,
         audio_quality: int = 192,
         preferred_caption_langs: Optional[List[str]] = None,
+        info_ttl_seconds: int = 300,
+        concurrent_fragments: int = 4,
+        max_async_downloads: int = 8,
     ):
         """Initialize the downloader.
 
@@ -43,48 +69,92 @@ class AudioDownloader:
             temp_dir: Directory for temporary files
             audio_quality: Audio bitrate in kbps
             preferred_caption_langs: List of preferred caption languages (default: ["en"])
+            info_ttl_seconds: How long fetched video metadata stays cached
+            concurrent_fragments: Parallel fragment downloads for HLS/DASH formats
+            max_async_downloads: Worker threads (and in-flight limit) for download_async
         """
         self.temp_dir = Path(temp_dir)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         self.audio_quality = audio_quality
         self.preferred_caption_langs = preferred_caption_langs or ["en"]
-
-    def _get_yt_dlp_options(self, output_template: str) -> dict:
+        self.info_ttl_seconds = info_ttl_seconds
+        self.concurrent_fragments = concurrent_fragments
+        self.max_async_downloads = max_async_downloads
+
+        # Worker pool and in-flight limit for download_async, created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._async_semaphore: Optional[asyncio.Semaphore] = None
+        self._executor_lock = threading.Lock()
+
+        # Options shared by every download; read-only so worker threads can
+        # merge from it without copying defensively
+        self._base_opts = MappingProxyType(
+            {
+                # Extract audio only (prefer m4a)
+                "format": "bestaudio[ext=m4a]/bestaudio/best",
+                "postprocessors": (
+                    {
+                        "key": "FFmpegExtractAudio",
+                        "preferredcodec": "mp3",
+                        "preferredquality": str(self.audio_quality),
+                    },
+                ),
+                # Subtitles/Captions
+                "writesubtitles": True,
+                "subtitleslangs": self.preferred_caption_langs,
+                "subtitlesformat": "vtt",
+                # Metadata
+                "writethumbnail": False,
+                # Behavior
+                "quiet": True,
+                "no_warnings": True,
+                "extract_flat": False,
+                "ignoreerrors": False,
+                # Network
+                "retries": 3,
+                "fragment_retries": 3,
+                "concurrent_fragment_downloads": self.concurrent_fragments,
+                "http_chunk_size": 10 << 20,  # 10MB ranged requests
+                "socket_timeout": 30,
+            }
+        )
+
+        # LRU cache of video_id -> (fetched_at, info), shared by worker threads
+        self._info_cache: OrderedDict[str, Tuple[float, dict]] = OrderedDict()
+        self._info_cache_lock = threading.Lock()
+
+    def _get_yt_dlp_options(
+        self, video_dir: Path, info: Optional[dict] = None
+    ) -> dict:
         """Get yt-dlp options for audio extraction.
 
+        Audio and captions are written in a single pass with fixed names
+        (media.mp3, media.<lang>.vtt) inside the video's temp directory.
+
         Args:
-            output_template: Output filename template
+            video_dir: Temp directory for this video's files
+            info: Already-fetched video metadata, if available
 
         Returns:
             Dictionary of yt-dlp options
         """
+        # Auto-generated captions are only needed when no manual captions
+        # exist in a preferred language
+        manual_langs = (info or {}).get("subtitles") or {}
+        has_manual_captions = any(
+            lang in manual_langs for lang in self.preferred_caption_langs
+        )
+
         return {
-            # Output template
-            "outtmpl": output_template,
-            # Extract audio only
-            "format": "bestaudio/best",
-            "postprocessors": [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": str(self.audio_quality),
-                }
-            ],
-            # Subtitles/Captions
-            "writesubtitles": True,
-            "writeautomaticsub": True,
-            "subtitleslangs": self.preferred_caption_langs,
-            "subtitlesformat": "vtt",
-            # Metadata
-            "writethumbnail": False,
-            # Behavior
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": False,
-            "ignoreerrors": False,
-            # Network
-            "retries": 3,
-            "fragment_retries": 3,
+            **self._base_opts,
+            # Output location
+            "paths": {"home": str(video_dir)},
+            # Built per call: yt-dlp fills in missing template keys in place
+            "outtmpl": {
+                "default": f"{OUTPUT_NAME}.%(ext)s",
+                "subtitle": f"{OUTPUT_NAME}.%(ext)s",
+            },
+            "writeautomaticsub": not has_manual_captions,
         }
 
     def get_video_info(self, url: str) -> Optional[dict]:
@@ -96,71 +166,142 @@ class AudioDownloader:
         Returns:
             Video metadata dictionary or None on error
         """
-        opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": False,
-            "skip_download": True,
-        }
+        video_id = URLParser.extract_video_id(url)
+        if video_id:
+            cached = self._get_cached_info(video_id)
+            if cached is not None:
+                logger.debug(f"Using cached video info for: {video_id}")
+                return cached
+
+        # Same format and caption selection as download(), so the info can
+        # be handed straight back to it
+        opts = {**self._base_opts, "skip_download": True}
 
         try:
-            with yt_dlp.YoutubeDL(opts) as ydl:
+            with _yt_dlp().YoutubeDL(opts) as ydl:
                 info = ydl.extract_info(url, download=False)
-                return info
         except Exception as e:
             logger.error(f"Failed to get video info: {e}")
             return None
 
-    def download(self, url: str, video_id: str) -> Optional[DownloadResult]:
+        if info and video_id:
+            with self._info_cache_lock:
+                self._info_cache[video_id] = (time.monotonic(), info)
+                self._info_cache.move_to_end(video_id)
+                if len(self._info_cache) > INFO_CACHE_SIZE:
+                    self._info_cache.popitem(last=False)
+
+        return info
+
+    def _get_cached_info(self, video_id: str) -> Optional[dict]:
+        """Return cached metadata for a video if it has not expired.
+
+        Args:
+            video_id: Video ID
+
+        Returns:
+            Cached metadata dictionary or None
+        """
+        with self._info_cache_lock:
+            entry = self._info_cache.get(video_id)
+            if entry is None:
+                return None
+
+            fetched_at, info = entry
+            if time.monotonic() - fetched_at >= self.info_ttl_seconds:
+                del self._info_cache[video_id]
+                return None
+
+            self._info_cache.move_to_end(video_id)
+            return info
+
+    def invalidate(self, video_id: str):
+        """Drop cached metadata for a video so the next lookup refetches it.
+
+        Args:
+            video_id: Video ID
+        """
+        with self._info_cache_lock:
+            self._info_cache.pop(video_id, None)
+
+    def download(
+        self, url: str, video_id: str, info: Optional[dict] = None
+    ) -> Optional[DownloadResult]:
         """Download audio and captions for a YouTube video.
 
         Args:
             url: YouTube URL
             video_id: Video ID (used for filenames)
+            info: Metadata previously returned by get_video_info. When given
+                (or still cached), the download reuses it instead of
+                extracting it again.
 
         Returns:
             DownloadResult with paths to downloaded files, or None on error
         """
-        # Create output paths
-        output_base = self.temp_dir / video_id
-        output_template = str(output_base)
+        # Create output paths (one subdirectory per video with fixed file
+        # names, so lookups never scan other videos' files)
+        video_dir = self.temp_dir / video_id
+        video_dir.mkdir(parents=True, exist_ok=True)
+
+        if info is None:
+            info = self._get_cached_info(video_id)
 
-        opts = self._get_yt_dlp_options(output_template)
+        opts = self._get_yt_dlp_options(video_dir, info)
 
         try:
             logger.info(f"Downloading audio and captions for: {video_id}")
 
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(url, download=True)
+            with _yt_dlp().YoutubeDL(opts) as ydl:
+                if info:
+                    # Same path as yt-dlp's --load-info-json: skips the
+                    # second metadata round trip to YouTube. Results of the
+                    # earlier format selection are dropped, so formats are
+                    # chosen again with this call's audio-only selector.
+                    info = ydl.sanitize_info(info, remove_private_keys=True)
+                    for key in ("format_id", "url"):
+                        info.pop(key, None)
+                    info = ydl.process_ie_result(info, download=True)
+                else:
+                    info = ydl.extract_info(url, download=True)
 
             if not info:
                 logger.error("No info returned from yt-dlp")
                 return None
 
-            # Find the downloaded audio file
-            audio_path = None
-            expected_audio = f"{output_base}.mp3"
-            if os.path.exists(expected_audio):
-                audio_path = expected_audio
-            else:
-                # Search for mp3 files with the video_id prefix
-                for f in self.temp_dir.glob(f"{video_id}*.mp3"):
-                    audio_path = str(f)
-                    break
+            # yt-dlp reports the final (post-processed) audio path
+            downloads = info.get("requested_downloads") or [{}]
+            audio_path = downloads[0].get("filepath")
+
+            if not audio_path or not audio_path.endswith(".mp3"):
+                # Older yt-dlp: look for the file on disk
+                audio_path = None
+                expected_audio = str(video_dir / f"{OUTPUT_NAME}.mp3")
+                if os.path.exists(expected_audio):
+                    audio_path = expected_audio
+                else:
+                    # Search for mp3 files in the video's directory
+                    for f in video_dir.glob("*.mp3"):
+                        audio_path = str(f)
+                        break
 
             if not audio_path:
                 logger.error(f"Audio file not found for {video_id}")
                 return None
 
             # Find caption files
-            caption_path, caption_source = self._find_best_caption(video_id)
+            if "requested_subtitles" in info:
+                caption_path, caption_source = self._caption_from_info(info)
+            else:
+                caption_path, caption_source = self._find_best_caption(video_id)
 
             # Extract metadata
             result = DownloadResult(
                 video_id=video_id,
                 title=info.get("title", "Unknown"),
                 channel=info.get("channel", info.get("uploader", "Unknown")),
-                duration=info.get("duration", 0),
+                # None for some live and premiere VODs
+                duration=int(info.get("duration") or 0),
                 upload_date=info.get("upload_date"),
                 audio_path=audio_path,
                 caption_path=caption_path,
@@ -177,13 +318,122 @@ class AudioDownloader:
 
             return result
 
-        except yt_dlp.DownloadError as e:
+        except _yt_dlp().DownloadError as e:
             logger.error(f"Download error for {video_id}: {e}")
             return None
         except Exception as e:
             logger.error(f"Unexpected error downloading {video_id}: {e}")
             return None
 
+    def download_many(
+        self, jobs: List[Union[str, Tuple[str, str]]], max_workers: int = 4
+    ) -> List[Optional[DownloadResult]]:
+        """Download several videos concurrently.
+
+        Network waits for one video overlap with ffmpeg post-processing of
+        another. Each download uses its own yt-dlp instance and temp
+        subdirectory, so jobs do not interfere with each other.
+
+        Args:
+            jobs: List of URLs or (url, video_id) tuples
+            max_workers: Maximum number of concurrent downloads
+
+        Returns:
+            List of DownloadResult (or None on error), in the same order as jobs
+        """
+        if not jobs:
+            return []
+
+        def run(job: Union[str, Tuple[str, str]]) -> Optional[DownloadResult]:
+            if isinstance(job, str):
+                video_id = URLParser.extract_video_id(job)
+                if not video_id:
+                    return None
+                job = (job, video_id)
+            return self.download(*job)
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(jobs)),
+            thread_name_prefix="yt-dlp",
+        ) as executor:
+            return list(executor.map(run, jobs))
+
+    async def download_async(
+        self, url: str, video_id: str, info: Optional[dict] = None
+    ) -> Optional[DownloadResult]:
+        """Download a video without blocking the event loop.
+
+        The blocking yt-dlp call runs on a shared worker pool. Callers can
+        schedule any number of these; at most max_async_downloads run at once
+        and the rest wait on a semaphore instead of tying up threads.
+
+        Args:
+            url: YouTube URL
+            video_id: Video ID for naming files
+            info: Already-fetched video metadata, if available
+
+        Returns:
+            DownloadResult or None on error
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_async_downloads,
+                    thread_name_prefix="yt-dlp",
+                )
+                self._async_semaphore = asyncio.Semaphore(self.max_async_downloads)
+
+        async with self._async_semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, self.download, url, video_id, info
+            )
+
+    def close(self):
+        """Shut down the download_async worker pool, if it was started."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+                self._async_semaphore = None
+
+    def _caption_from_info(self, info: dict) -> tuple[Optional[str], Optional[str]]:
+        """Pick the best caption from the subtitles yt-dlp reports as written.
+
+        Uses the same priority as _find_best_caption, but reads paths from
+        the info dict instead of the filesystem.
+
+        Args:
+            info: Video info returned by yt-dlp after downloading
+
+        Returns:
+            Tuple of (caption_path, source) or (None, None)
+        """
+        written = {
+            lang: sub["filepath"]
+            for lang, sub in (info.get("requested_subtitles") or {}).items()
+            if sub.get("filepath")
+        }
+        if not written:
+            logger.debug(f"No captions found for {info.get('id')}")
+            return None, None
+
+        manual_langs = info.get("subtitles") or {}
+
+        def source(lang: str) -> str:
+            return "manual" if lang in manual_langs else "auto"
+
+        # Per preferred language: manual captions, then auto-generated ones
+        # (which may be written under either "<lang>" or "<lang>-orig")
+        for lang in self.preferred_caption_langs:
+            for key in (lang, f"{lang}-orig"):
+                if key in written:
+                    return written[key], source(key)
+
+        # Fall back to any caption that was written
+        lang = sorted(written)[0]
+        return written[lang], source(lang)
+
     def _find_best_caption(self, video_id: str) -> tuple[Optional[str], Optional[str]]:
         """Find the best available caption file.
 
@@ -197,29 +447,34 @@ class AudioDownloader:
         Returns:
             Tuple of (caption_path, source) or (None, None)
         """
-        # Look for caption files
+        video_dir = self.temp_dir / video_id
+
+        # List the video's directory once instead of probing each candidate
+        try:
+            vtt_files = {
+                f.name: f for f in video_dir.iterdir() if f.suffix == ".vtt"
+            }
+        except FileNotFoundError:
+            vtt_files = {}
+
         for lang in self.preferred_caption_langs:
-            # Check for manual captions first (e.g., video_id.en.vtt)
-            manual_path = self.temp_dir / f"{video_id}.{lang}.vtt"
-            if manual_path.exists():
-                logger.debug(f"Found manual captions: {manual_path}")
-                return str(manual_path), "manual"
-
-            # Check for auto-generated (e.g., video_id.en-orig.vtt or similar patterns)
-            for pattern in [
-                f"{video_id}.{lang}-orig.vtt",
-                f"{video_id}.{lang}.vtt",
-            ]:
-                auto_path = self.temp_dir / pattern
-                if auto_path.exists():
-                    logger.debug(f"Found auto-generated captions: {auto_path}")
-                    return str(auto_path), "auto"
-
-        # Search more broadly
-        for vtt_file in self.temp_dir.glob(f"{video_id}*.vtt"):
+            # Manual captions first (e.g., media.en.vtt)
+            manual = vtt_files.get(f"{OUTPUT_NAME}.{lang}.vtt")
+            if manual:
+                logger.debug(f"Found manual captions: {manual}")
+                return str(manual), "manual"
+
+            # Auto-generated captions (e.g., media.en-orig.vtt)
+            auto = vtt_files.get(f"{OUTPUT_NAME}.{lang}-orig.vtt")
+            if auto:
+                logger.debug(f"Found auto-generated captions: {auto}")
+                return str(auto), "auto"
+
+        # Fall back to any caption file
+        for name, vtt_file in sorted(vtt_files.items()):
             logger.debug(f"Found caption file: {vtt_file}")
             # Determine if manual or auto based on filename
-            source = "auto" if "-orig" in vtt_file.name else "manual"
+            source = "auto" if "-orig" in name else "manual"
             return str(vtt_file), source
 
         logger.debug(f"No captions found for {video_id}")
@@ -231,20 +486,17 @@ class AudioDownloader:
         Args:
             video_id: Video ID to clean up
         """
-        try:
-            for f in self.temp_dir.glob(f"{video_id}*"):
-                if f.is_file():
-                    f.unlink()
-                    logger.debug(f"Cleaned up: {f}")
-        except Exception as e:
-            logger.warning(f"Cleanup error for {video_id}: {e}")
+        video_dir = self.temp_dir / video_id
+        shutil.rmtree(video_dir, ignore_errors=True)
+        logger.debug(f"Cleaned up: {video_dir}")
 
     def cleanup_all(self):
         """Remove all temporary files."""
         try:
-            for f in self.temp_dir.iterdir():
-                if f.is_file():
-                    f.unlink()
+            # Everything lives in per-video subdirectories, so drop the whole
+            # tree and recreate the root
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir.mkdir(parents=True, exist_ok=True)
             logger.info("Cleaned up all temporary files")
         except Exception as e:
             logger.warning(f"Cleanup error: {e}")
@@ -3,16 +3,23 @@
 import os
 import logging
 from dataclasses import dataclass
-from typing import List, Optional
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _bool(env: Dict[str, str], key: str, default: str) -> bool:
+    """Read a "true"/"false" flag from an environment snapshot."""
+    return env.get(key, default).lower() == "true"
+
+
+def _int(env: Dict[str, str], key: str, default: str) -> int:
+    """Read an integer from an environment snapshot."""
+    return int(env.get(key, default))
+
+
+@dataclass(slots=True)
 class Config:
     """Application configuration from environment variables."""
 
@@ -25,6 +32,10 @@ class Config:
 
     # Whisper (fallback transcription)
     whisper_model: str
+    whisper_device: str
+    whisper_compute_type: Optional[str]
+    whisper_beam_size: int
+    whisper_vad_filter: bool
 
     # Audio processing
     audio_quality: int
@@ -33,7 +44,7 @@ class Config:
     dropbox_app_key: Optional[str]
     dropbox_app_secret: Optional[str]
     dropbox_redirect_uri: Optional[str]
-    allowed_accounts: List[str]
+    allowed_accounts: FrozenSet[str]
 
     # Notifications
     telegram_enabled: bool
@@ -49,6 +60,7 @@ class Config:
     poll_interval: int
     max_retries: int
     retry_delay: int
+    max_concurrent_jobs: int
 
     # OAuth Server
     oauth_server_port: int
@@ -61,34 +73,43 @@ class Config:
     max_tags_per_file: int
     enable_detailed_logs: bool
 
-    # Paths
-    data_dir: str
-    tokens_dir: str
-    inbox_dir: str
-    outbox_dir: str
-    archive_dir: str
-    logs_dir: str
+    # Paths (built once here, so components don't each wrap the strings)
+    data_dir: Path
+    tokens_dir: Path
+    inbox_dir: Path
+    outbox_dir: Path
+    archive_dir: Path
+    logs_dir: Path
     processed_db_path: str
-    temp_dir: str
+    temp_dir: Path
 
     @classmethod
     def from_env(cls) -> "Config":
         """Load configuration from environment variables."""
-        mode = os.getenv("MODE", "local").lower()
+        # Load .env unless the environment is already fully provided
+        if os.getenv("SKIP_DOTENV") != "1":
+            from dotenv import load_dotenv
+
+            load_dotenv()
+
+        # Read the environment once so all values come from one consistent view
+        env = dict(os.environ)
+
+        mode = env.get("MODE", "local").lower()
 
         # Validate mode
         if mode not in ["local", "dropbox"]:
             raise ValueError(f"Invalid MODE: {mode}. Must be 'local' or 'dropbox'")
 
         # Gemini API (required)
-        gemini_api_key = os.getenv("GEMINI_API_KEY")
+        gemini_api_key = env.get("GEMINI_API_KEY")
         if not gemini_api_key:
             raise ValueError("GEMINI_API_KEY environment variable is required")
 
-        gemini_model = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+        gemini_model = env.get("GEMINI_MODEL", "gemini-2.5-flash")
 
         # Whisper configuration (fallback transcription)
-        whisper_model = os.getenv("WHISPER_MODEL", "base")
+        whisper_model = env.get("WHISPER_MODEL", "base")
         valid_whisper_models = ["tiny", "base", "small", "medium", "large-v3"]
         if whisper_model not in valid_whisper_models:
             logger.warning(
@@ -97,13 +118,26 @@ class Config:
             )
             whisper_model = "base"
 
+        # "auto" uses a CUDA GPU when CTranslate2 can see one; the compute
+        # type defaults to int8_float16 on GPU and int8 on CPU
+        whisper_device = env.get("WHISPER_DEVICE", "auto").lower()
+        if whisper_device not in ["auto", "cpu", "cuda"]:
+            logger.warning(
+                f"Unknown WHISPER_DEVICE: {whisper_device}. "
+                "Valid options: auto, cpu, cuda. Defaulting to 'auto'."
+            )
+            whisper_device = "auto"
+        whisper_compute_type = env.get("WHISPER_COMPUTE_TYPE") or None
+        whisper_beam_size = _int(env, "WHISPER_BEAM_SIZE", "5")
+        whisper_vad_filter = _bool(env, "WHISPER_VAD_FILTER", "true")
+
         # Audio quality
-        audio_quality = int(os.getenv("AUDIO_QUALITY", "192"))
+        audio_quality = _int(env, "AUDIO_QUALITY", "192")
 
         # Dropbox OAuth (required for dropbox mode)
-        dropbox_app_key = os.getenv("DROPBOX_APP_KEY")
-        dropbox_app_secret = os.getenv("DROPBOX_APP_SECRET")
-        dropbox_redirect_uri = os.getenv(
+        dropbox_app_key = env.get("DROPBOX_APP_KEY")
+        dropbox_app_secret = env.get("DROPBOX_APP_SECRET")
+        dropbox_redirect_uri = env.get(
             "DROPBOX_REDIRECT_URI", "http://localhost:8080/oauth/callback"
         )
 
@@ -114,10 +148,10 @@ class Config:
                 )
 
         # Allowed accounts
-        allowed_accounts_str = os.getenv("ALLOWED_ACCOUNTS", "")
-        allowed_accounts = [
+        allowed_accounts_str = env.get("ALLOWED_ACCOUNTS", "")
+        allowed_accounts = frozenset(
             acc.strip() for acc in allowed_accounts_str.split(",") if acc.strip()
-        ]
+        )
 
         if mode == "dropbox" and not allowed_accounts:
             logger.warning(
@@ -126,9 +160,9 @@ class Config:
             )
 
         # Telegram notifications
-        telegram_enabled = os.getenv("TELEGRAM_ENABLED", "false").lower() == "true"
-        telegram_bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
-        telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID")
+        telegram_enabled = _bool(env, "TELEGRAM_ENABLED", "false")
+        telegram_bot_token = env.get("TELEGRAM_BOT_TOKEN")
+        telegram_chat_id = env.get("TELEGRAM_CHAT_ID")
 
         if telegram_enabled and (not telegram_bot_token or not telegram_chat_id):
             logger.warning(
@@ -138,14 +172,14 @@ class Config:
             telegram_enabled = False
 
         # Email notifications
-        email_enabled = os.getenv("EMAIL_ENABLED", "false").lower() == "true"
+        email_enabled = _bool(env, "EMAIL_ENABLED", "false")
         email_config = {
-            "smtp_host": os.getenv("EMAIL_SMTP_HOST", "smtp.gmail.com"),
-            "smtp_port": int(os.getenv("EMAIL_SMTP_PORT", "587")),
-            "username": os.getenv("EMAIL_USERNAME"),
-            "password": os.getenv("EMAIL_PASSWORD"),
-            "from_address": os.getenv("EMAIL_FROM"),
-            "to_address": os.getenv("EMAIL_TO"),
+            "smtp_host": env.get("EMAIL_SMTP_HOST", "smtp.gmail.com"),
+            "smtp_port": _int(env, "EMAIL_SMTP_PORT", "587"),
+            "username": env.get("EMAIL_USERNAME"),
+            "password": env.get("EMAIL_PASSWORD"),
+            "from_address": env.get("EMAIL_FROM"),
+            "to_address": env.get("EMAIL_TO"),
         }
 
         if email_enabled and not all(
@@ -163,37 +197,34 @@ class Config:
             email_enabled = False
 
         # Logging
-        log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+        log_level = env.get("LOG_LEVEL", "INFO").upper()
 
         # Processing options
-        poll_interval = int(os.getenv("POLL_INTERVAL", "30"))
-        max_retries = int(os.getenv("MAX_RETRIES", "3"))
-        retry_delay = int(os.getenv("RETRY_DELAY", "2"))
+        poll_interval = _int(env, "POLL_INTERVAL", "30")
+        max_retries = _int(env, "MAX_RETRIES", "3")
+        retry_delay = _int(env, "RETRY_DELAY", "2")
+        max_concurrent_jobs = max(1, _int(env, "MAX_CONCURRENT_JOBS", "3"))
 
         # OAuth server
-        oauth_server_port = int(os.getenv("OAUTH_SERVER_PORT", "8080"))
-        oauth_server_host = os.getenv("OAUTH_SERVER_HOST", "0.0.0.0")
-        oauth_always_enabled = (
-            os.getenv("OAUTH_ALWAYS_ENABLED", "false").lower() == "true"
-        )
+        oauth_server_port = _int(env, "OAUTH_SERVER_PORT", "8080")
+        oauth_server_host = env.get("OAUTH_SERVER_HOST", "0.0.0.0")
+        oauth_always_enabled = _bool(env, "OAUTH_ALWAYS_ENABLED", "false")
 
         # Tag Features
-        enable_tags = os.getenv("ENABLE_TAGS", "true").lower() == "true"
-        enable_tag_learning = os.getenv("ENABLE_TAG_LEARNING", "true").lower() == "true"
-        max_tags_per_file = int(os.getenv("MAX_TAGS_PER_FILE", "3"))
-        enable_detailed_logs = (
-            os.getenv("ENABLE_DETAILED_LOGS", "true").lower() == "true"
-        )
+        enable_tags = _bool(env, "ENABLE_TAGS", "true")
+        enable_tag_learning = _bool(env, "ENABLE_TAG_LEARNING", "true")
+        max_tags_per_file = _int(env, "MAX_TAGS_PER_FILE", "3")
+        enable_detailed_logs = _bool(env, "ENABLE_DETAILED_LOGS", "true")
 
         # Paths
-        data_dir = os.getenv("DATA_DIR", "/app/data")
-        tokens_dir = os.path.join(data_dir, "tokens")
-        inbox_dir = os.path.join(data_dir, "Inbox")
-        outbox_dir = os.path.join(data_dir, "Outbox")
-        archive_dir = os.path.join(data_dir, "Archive")
-        logs_dir = os.path.join(data_dir, "Logs")
-        temp_dir = os.path.join(data_dir, "temp")
-        processed_db_path = os.path.join(data_dir, "processed.db")
+        data_dir = Path(env.get("DATA_DIR", "/app/data"))
+        tokens_dir = data_dir / "tokens"
+        inbox_dir = data_dir / "Inbox"
+        outbox_dir = data_dir / "Outbox"
+        archive_dir = data_dir / "Archive"
+        logs_dir = data_dir / "Logs"
+        temp_dir = data_dir / "temp"
+        processed_db_path = os.fspath(data_dir / "processed.db")
 
         # Ensure directories exist
         for dir_path in [
@@ -204,13 +235,17 @@ class Config:
             logs_dir,
             temp_dir,
         ]:
-            os.makedirs(dir_path, exist_ok=True)
+            dir_path.mkdir(parents=True, exist_ok=True)
 
         return cls(
             mode=mode,
             gemini_api_key=gemini_api_key,
             gemini_model=gemini_model,
             whisper_model=whisper_model,
+            whisper_device=whisper_device,
+            whisper_compute_type=whisper_compute_type,
+            whisper_beam_size=whisper_beam_size,
+            whisper_vad_filter=whisper_vad_filter,
             audio_quality=audio_quality,
             dropbox_app_key=dropbox_app_key,
             dropbox_app_secret=dropbox_app_secret,
@@ -225,6 +260,7 @@ class Config:
             poll_interval=poll_interval,
             max_retries=max_retries,
             retry_delay=retry_delay,
+            max_concurrent_jobs=max_concurrent_jobs,
             oauth_server_port=oauth_server_port,
             oauth_server_host=oauth_server_host,
             oauth_always_enabled=oauth_always_enabled,
@@ -4,11 +4,11 @@ import logging
 import secrets
 import hashlib
 import base64
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlencode, parse_qs, urlparse
-
-import dropbox
-import requests
+import threading
+from html import escape
+from typing import Iterable
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlencode, parse_qsl, urlparse
 
 from .storage import TokenStorage
 
@@ -20,105 +20,139 @@ class OAuthCallbackHandler(BaseHTTPRequestHandler):
 
     oauth_manager = None  # Set by OAuthManager
 
+    # Every response carries Content-Length, so the browser can reuse one
+    # connection for the root page and the callback
+    protocol_version = "HTTP/1.1"
+    # Drop idle keep-alive connections instead of holding a thread forever
+    timeout = 30
+
+    # Static pages, encoded once
+    SUCCESS_HTML = (
+        b"<h1>Authorization Successful!</h1>"
+        b"<p>You can close this window and return to the application.</p>"
+        b"<p>VoxBox is now connected to your Dropbox.</p>"
+    )
+    MISSING_PARAMS_HTML = (
+        b"<h1>Bad Request</h1><p>Missing authorization code or state</p>"
+    )
+    BAD_STATE_HTML = b"<h1>Invalid State</h1><p>CSRF validation failed</p>"
+    NOT_FOUND_HTML = b"<h1>Not Found</h1>"
+
+    # Root page; only the authorization URL changes between requests
+    ROOT_TEMPLATE = b"""
+            <html>
+            <head><title>VoxBox Authorization</title></head>
+            <body>
+                <h1>VoxBox - Dropbox Authorization</h1>
+                <p>Click the link below to authorize this application with your Dropbox account:</p>
+                <p><a href="{auth_url}">Authorize with Dropbox</a></p>
+                <p style="color: #666; margin-top: 20px;">
+                    VoxBox will create an App Folder in your Dropbox with Inbox, Outbox, and Archive folders.
+                </p>
+            </body>
+            </html>
+            """
+
     def log_message(self, format, *args):
         """Override to use our logger."""
         logger.debug(f"OAuth callback: {format % args}")
 
+    def _send_html(self, status: int, body: bytes):
+        """Send an HTML response with an explicit Content-Length.
+
+        Args:
+            status: HTTP status code
+            body: Encoded HTML body
+        """
+        self.send_response(status)
+        self.send_header("Content-type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_GET(self):
         """Handle GET request (OAuth callback)."""
         parsed_path = urlparse(self.path)
 
-        if parsed_path.path == "/oauth/callback":
-            query_params = parse_qs(parsed_path.query)
+        handler = self.HANDLERS.get(parsed_path.path)
+        if handler is None:
+            self._send_html(404, self.NOT_FOUND_HTML)
+            return
 
-            auth_code = query_params.get("code", [None])[0]
-            state = query_params.get("state", [None])[0]
-            error = query_params.get("error", [None])[0]
+        handler(self, parsed_path.query)
 
-            if error:
-                self.send_response(400)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                self.wfile.write(
-                    f"<h1>Authorization Failed</h1><p>Error: {error}</p>".encode()
-                )
-                return
-
-            if not auth_code or not state:
-                self.send_response(400)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                self.wfile.write(
-                    b"<h1>Bad Request</h1><p>Missing authorization code or state</p>"
-                )
-                return
+    def _handle_callback(self, query: str):
+        """Handle the OAuth redirect carrying the authorization code.
 
-            # Validate state (CSRF protection)
-            if state != self.oauth_manager.state:
-                self.send_response(400)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                self.wfile.write(b"<h1>Invalid State</h1><p>CSRF validation failed</p>")
-                return
+        Args:
+            query: Raw query string of the callback URL
+        """
+        # Single-valued params; cap field count so crafted query strings
+        # can't blow up parsing
+        try:
+            query_params = dict(parse_qsl(query, max_num_fields=16))
+        except ValueError:
+            self._send_html(400, self.MISSING_PARAMS_HTML)
+            return
+
+        auth_code = query_params.get("code")
+        state = query_params.get("state")
+        error = query_params.get("error")
+
+        if error:
+            self._send_html(
+                400,
+                f"<h1>Authorization Failed</h1><p>Error: {escape(error)}</p>".encode(),
+            )
+            return
 
-            # Exchange code for token
-            try:
-                success, message = self.oauth_manager.exchange_code_for_token(auth_code)
-
-                if success:
-                    self.send_response(200)
-                    self.send_header("Content-type", "text/html")
-                    self.end_headers()
-                    self.wfile.write(
-                        b"<h1>Authorization Successful!</h1>"
-                        b"<p>You can close this window and return to the application.</p>"
-                        b"<p>VoxBox is now connected to your Dropbox.</p>"
-                    )
-                else:
-                    self.send_response(403)
-                    self.send_header("Content-type", "text/html")
-                    self.end_headers()
-                    self.wfile.write(
-                        f"<h1>Authorization Failed</h1><p>{message}</p>".encode()
-                    )
+        if not auth_code or not state:
+            self._send_html(400, self.MISSING_PARAMS_HTML)
+            return
 
-                # Signal server to stop
-                self.oauth_manager.authorization_complete = True
+        # Validate state (CSRF protection)
+        if state != self.oauth_manager.state:
+            self._send_html(400, self.BAD_STATE_HTML)
+            return
 
-            except Exception as e:
-                logger.error(f"Error during token exchange: {e}")
-                self.send_response(500)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                self.wfile.write(f"<h1>Server Error</h1><p>{str(e)}</p>".encode())
+        # Exchange code for token
+        try:
+            success, message = self.oauth_manager.exchange_code_for_token(auth_code)
+
+            if success:
+                self._send_html(200, self.SUCCESS_HTML)
+            else:
+                self._send_html(
+                    403,
+                    f"<h1>Authorization Failed</h1><p>{escape(message)}</p>".encode(),
+                )
 
-        elif parsed_path.path == "/":
-            # Root page with authorization link
-            auth_url = self.oauth_manager.get_authorization_url()
+            # Signal server to stop (response has been written)
+            self.oauth_manager.auth_done_event.set()
 
-            self.send_response(200)
-            self.send_header("Content-type", "text/html")
-            self.end_headers()
-            html = f"""
-            <html>
-            <head><title>VoxBox Authorization</title></head>
-            <body>
-                <h1>VoxBox - Dropbox Authorization</h1>
-                <p>Click the link below to authorize this application with your Dropbox account:</p>
-                <p><a href="{auth_url}">Authorize with Dropbox</a></p>
-                <p style="color: #666; margin-top: 20px;">
-                    VoxBox will create an App Folder in your Dropbox with Inbox, Outbox, and Archive folders.
-                </p>
-            </body>
-            </html>
-            """
-            self.wfile.write(html.encode())
+        except Exception as e:
+            logger.error(f"Error during token exchange: {e}")
+            self._send_html(
+                500, f"<h1>Server Error</h1><p>{escape(str(e))}</p>".encode()
+            )
+
+    def _handle_root(self, query: str):
+        """Serve the root page with the authorization link.
+
+        Args:
+            query: Raw query string (unused)
+        """
+        auth_url = self.oauth_manager.get_authorization_url()
+        self._send_html(
+            200,
+            self.ROOT_TEMPLATE.replace(b"{auth_url}", escape(auth_url).encode("ascii")),
+        )
 
-        else:
-            self.send_response(404)
-            self.send_header("Content-type", "text/html")
-            self.end_headers()
-            self.wfile.write(b"<h1>Not Found</h1>")
+    # Path -> handler dispatch; anything else is a 404
+    HANDLERS = {
+        "/oauth/callback": _handle_callback,
+        "/": _handle_root,
+    }
 
 
 class OAuthManager:
@@ -130,7 +164,7 @@ class OAuthManager:
         app_secret: str,
         redirect_uri: str,
         token_storage: TokenStorage,
-        allowed_accounts: list,
+        allowed_accounts: Iterable[str],
     ):
         """Initialize OAuth manager.
 
@@ -145,27 +179,72 @@ class OAuthManager:
         self.app_secret = app_secret
         self.redirect_uri = redirect_uri
         self.token_storage = token_storage
-        self.allowed_accounts = allowed_accounts
+        # Set for O(1) membership; emails compared case-insensitively,
+        # account IDs exactly
+        self.allowed_accounts = frozenset(
+            acc.lower() if "@" in acc else acc for acc in allowed_accounts
+        )
 
         # OAuth state for CSRF protection
         self.state = secrets.token_urlsafe(32)
         self.code_verifier = None
-        self.authorization_complete = False
+        self.auth_done_event = threading.Event()
+
+        # Keep-alive session for token endpoint calls, created on first use.
+        # Watcher threads refresh tokens concurrently, so creation is locked.
+        self._http = None
+        self._http_lock = threading.Lock()
 
         logger.info("Initialized OAuth manager")
 
+    def _session(self):
+        """Get the keep-alive session for token endpoint calls.
+
+        Refreshes reuse the pooled TLS connection. requests is imported here
+        so modes that never touch OAuth don't pay for it at startup.
+
+        Returns:
+            requests.Session instance
+        """
+        with self._http_lock:
+            if self._http is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                # Retry only failed connects: POST is never retried once sent,
+                # since an authorization code is single-use
+                session = requests.Session()
+                session.mount(
+                    "https://",
+                    HTTPAdapter(
+                        pool_connections=4,
+                        pool_maxsize=8,
+                        max_retries=Retry(total=3, backoff_factor=0.3),
+                    ),
+                )
+                self._http = session
+            return self._http
+
     def get_authorization_url(self) -> str:
         """Generate Dropbox authorization URL.
 
         Returns:
             Authorization URL
         """
-        # PKCE code verifier and challenge
-        code_verifier = secrets.token_urlsafe(64)
+        # PKCE code verifier and challenge. 48 random bytes always encode to
+        # a 64-character verifier (RFC 7636 allows 43-128).
+        code_verifier = (
+            base64.urlsafe_b64encode(secrets.token_bytes(48))
+            .rstrip(b"=")
+            .decode("ascii")
+        )
         code_challenge = (
-            base64.urlsafe_b64encode(hashlib.sha256(code_verifier.encode()).digest())
-            .decode()
-            .rstrip("=")
+            base64.urlsafe_b64encode(
+                hashlib.sha256(code_verifier.encode("ascii")).digest()
+            )
+            .rstrip(b"=")
+            .decode("ascii")
         )
 
         # Store for later use
@@ -207,7 +286,7 @@ class OAuthManager:
                 "code_verifier": self.code_verifier,
             }
 
-            response = requests.post(token_url, data=data)
+            response = self._session().post(token_url, data=data, timeout=10)
             response.raise_for_status()
 
             token_data = response.json()
@@ -215,6 +294,8 @@ class OAuthManager:
             refresh_token = token_data.get("refresh_token")
 
             # Get account info
+            import dropbox
+
             dbx = dropbox.Dropbox(access_token)
             account = dbx.users_get_current_account()
 
@@ -227,7 +308,7 @@ class OAuthManager:
             if self.allowed_accounts:
                 if (
                     account_id not in self.allowed_accounts
-                    and account_email not in self.allowed_accounts
+                    and account_email.lower() not in self.allowed_accounts
                 ):
                     logger.warning(
                         f"Account not in allowlist: {account_email} ({account_id})"
@@ -267,15 +348,21 @@ class OAuthManager:
         # Set up callback handler
         OAuthCallbackHandler.oauth_manager = self
 
-        # Create server
-        server = HTTPServer((host, port), OAuthCallbackHandler)
+        # Create server (threaded, so the root page and the callback never
+        # block each other)
+        server = ThreadingHTTPServer((host, port), OAuthCallbackHandler)
 
         logger.info(f"OAuth server started at http://{host}:{port}")
         logger.info(f"Visit http://localhost:{port} to begin authorization")
 
-        # Run until authorization complete
-        while not self.authorization_complete:
-            server.handle_request()
+        # Serve in the background and block until the callback completes
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+
+        self.auth_done_event.wait()
+
+        server.shutdown()
+        server.server_close()
 
         logger.info("Authorization flow completed")
         return True
@@ -304,7 +391,7 @@ class OAuthManager:
                 "client_secret": self.app_secret,
             }
 
-            response = requests.post(token_url, data=data)
+            response = self._session().post(token_url, data=data, timeout=10)
             response.raise_for_status()
 
             new_token_data = response.json()
@@ -320,3 +407,9 @@ class OAuthManager:
             logger.error(f"Error refreshing token for {account_id}: {e}")
             return False
 
+    def close(self):
+        """Close pooled HTTP connections."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
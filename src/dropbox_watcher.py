@@ -1,12 +1,28 @@
 """Dropbox App Folder watcher for video processing jobs."""
 
+import codecs
+import functools
+import io
 import logging
+import mmap
+import threading
 import time
-from typing import Dict, Optional, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
 
 import dropbox
 from dropbox.exceptions import ApiError, AuthError
-from dropbox.files import FileMetadata
+from dropbox.files import (
+    CommitInfo,
+    CreateFolderError,
+    FileMetadata,
+    ListFolderContinueError,
+    UploadSessionCursor,
+    UploadSessionFinishArg,
+    UploadSessionType,
+    WriteMode,
+)
 
 from .storage import TokenStorage
 from .job_processor import JobProcessor
@@ -14,6 +30,103 @@ from .dropbox_oauth import OAuthManager
 
 logger = logging.getLogger(__name__)
 
+# Bound once; anchored at both ends via fullmatch
+_match_job_file = JobProcessor.JOB_FILE_RE.fullmatch
+
+# Seconds a cached Dropbox client is reused before being rebuilt from storage
+CLIENT_TTL = 3500
+
+# Seconds Dropbox holds a longpoll request open when nothing changes (max 480)
+LONGPOLL_TIMEOUT = 480
+
+# Job files at least this large are decoded while streaming
+JOB_STREAM_THRESHOLD = 64 * 1024
+
+# Top-level folders every App Folder needs
+APP_FOLDERS = ["/Inbox", "/Outbox", "/Archive", "/Logs"]
+
+# Default /Outbox/tags.txt for new accounts
+DEFAULT_TAGS_TXT = "\n".join(
+    [
+        "education",
+        "tutorial",
+        "podcast",
+        "interview",
+        "documentary",
+        "entertainment",
+        "technology",
+        "science",
+        "business",
+        "health",
+    ]
+)
+
+# /README.txt for new accounts
+README_TXT = """# VoxBox - Video to Obsidian Knowledge Pipeline
+
+This is your VoxBox App Folder. Here's how it works:
+
+## Folder Structure
+- **/Inbox/** - Drop .txt files containing YouTube URLs here
+- **/Outbox/** - Processed notes and audio appear here
+- **/Archive/** - Processed job files are moved here
+- **/Logs/** - Processing logs
+
+## Usage
+1. Create a .txt file with a YouTube URL (just paste the URL)
+2. Upload it to /Inbox/
+3. VoxBox processes it automatically
+4. Find your note in /Outbox/YYYY-MM-DD_Video_Title/
+   - audio.mp3 - The audio file
+   - Video_Title.md - Obsidian note with summary and transcript
+
+## Tags
+Edit /Outbox/tags.txt to customize available tags for categorization.
+
+---
+Powered by VoxBox - Video to Obsidian Knowledge Pipeline
+"""
+
+# Files up to this size are uploaded in one request; larger ones in chunks
+UPLOAD_SINGLE_REQUEST_LIMIT = 8 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+UPLOAD_CHUNK_WORKERS = 4
+
+
+def refresh_on_auth_error(default):
+    """Retry a per-account operation once after refreshing an expired token.
+
+    The wrapped method must take account_id as its first argument and let
+    AuthError propagate.
+
+    Args:
+        default: Value returned when the token can't be refreshed
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, account_id: str, *args, **kwargs):
+            try:
+                return method(self, account_id, *args, **kwargs)
+            except AuthError:
+                logger.warning(
+                    f"Token expired for account {account_id}, attempting refresh..."
+                )
+
+            if not self._refresh_client(account_id):
+                logger.error(f"Failed to refresh token for account: {account_id}")
+                return default
+
+            try:
+                return method(self, account_id, *args, **kwargs)
+            except AuthError as e:
+                logger.error(f"Authentication failed for account {account_id}: {e}")
+                return default
+
+        return wrapper
+
+    return decorator
+
 
 class DropboxWatcher:
     """Watches Dropbox App Folders for new job files (.txt with YouTube URLs)."""
@@ -24,6 +137,8 @@ class DropboxWatcher:
         job_processor: JobProcessor,
         oauth_manager: OAuthManager,
         poll_interval: int = 30,
+        max_workers: int = 4,
+        stop_event: Optional[threading.Event] = None,
     ):
         """Initialize Dropbox watcher.
 
@@ -31,30 +146,71 @@ class DropboxWatcher:
             token_storage: Token storage instance
             job_processor: Job processor instance
             oauth_manager: OAuth manager for token refresh
-            poll_interval: Seconds between polling for new files
+            poll_interval: Seconds between checks for new accounts and retries after errors
+            max_workers: Maximum number of job files processed concurrently
+            stop_event: Event that ends run() when set (e.g. by a signal
+                handler); a private one is created if None
         """
         self.token_storage = token_storage
         self.job_processor = job_processor
         self.oauth_manager = oauth_manager
         self.poll_interval = poll_interval
 
-        # Track cursors for each account (for delta sync)
-        self.cursors: Dict[str, Optional[str]] = {}
-
         # Track initialized accounts (to avoid re-creating folders)
         self.initialized_accounts = set()
 
+        # Track cursors for each account (for delta sync), resuming from the
+        # ones saved by the previous run
+        self.cursors: Dict[str, Optional[str]] = {}
+        for account_id in self.token_storage.list_accounts():
+            state = self.token_storage.load_state(account_id)
+            if state.get("cursor"):
+                self.cursors[account_id] = state["cursor"]
+            if state.get("initialized"):
+                self.initialized_accounts.add(account_id)
+
+        # Last cursor written to storage per account
+        self._saved_cursors: Dict[str, Optional[str]] = dict(self.cursors)
+
+        # Cached clients per account: account_id -> (client, created_at)
+        self._clients: Dict[str, Tuple[dropbox.Dropbox, float]] = {}
+
+        # One pooled HTTP session shared by all clients, so TLS connections
+        # are reused across calls and accounts. Sized for every file worker
+        # uploading chunks in parallel, plus headroom for listing/longpoll.
+        self._http = dropbox.create_session(
+            max_connections=max_workers * UPLOAD_CHUNK_WORKERS + 8
+        )
+
+        # One longpoll thread per account, started by run()
+        self._account_threads: Dict[str, threading.Thread] = {}
+        self._stop_event = stop_event or threading.Event()
+
+        # Job files are dominated by network waits (Dropbox, YouTube, Gemini),
+        # so process several at once
+        self._file_pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="dropbox-file"
+        )
+
         logger.info("Initialized Dropbox watcher for VoxBox")
 
     def get_dropbox_client(self, account_id: str) -> Optional[dropbox.Dropbox]:
         """Get authenticated Dropbox client for an account.
 
+        Clients are cached per account. The token isn't probed up front; an
+        expired token surfaces as AuthError from the real call, which
+        refresh_on_auth_error handles.
+
         Args:
             account_id: Dropbox account ID
 
         Returns:
-            Dropbox client or None if token invalid
+            Dropbox client or None if no token is stored
         """
+        cached = self._clients.get(account_id)
+        if cached and time.monotonic() - cached[1] < CLIENT_TTL:
+            return cached[0]
+
         token_data = self.token_storage.load_token(account_id)
 
         if not token_data:
@@ -62,38 +218,53 @@ class DropboxWatcher:
             return None
 
         try:
-            dbx = dropbox.Dropbox(token_data["access_token"])
-            # Test the connection
-            dbx.users_get_current_account()
-            return dbx
-
-        except AuthError:
-            logger.warning(
-                f"Token expired for account {account_id}, attempting refresh..."
-            )
-
-            # Try to refresh token
-            if self.oauth_manager.refresh_token(account_id):
-                # Try again with refreshed token
-                token_data = self.token_storage.load_token(account_id)
-                dbx = dropbox.Dropbox(token_data["access_token"])
-                return dbx
-            else:
-                logger.error(f"Failed to refresh token for account: {account_id}")
-                return None
-
+            dbx = dropbox.Dropbox(token_data["access_token"], session=self._http)
         except Exception as e:
             logger.error(f"Error creating Dropbox client for {account_id}: {e}")
             return None
 
-    def list_new_files(self, account_id: str) -> List[FileMetadata]:
-        """List new .txt job files in the App Folder's Inbox.
+        self._clients[account_id] = (dbx, time.monotonic())
+        return dbx
+
+    def _refresh_client(self, account_id: str) -> bool:
+        """Refresh an account's access token and drop its cached client.
 
         Args:
             account_id: Dropbox account ID
 
         Returns:
-            List of new file metadata
+            True if the token was refreshed
+        """
+        self._clients.pop(account_id, None)
+        return self.oauth_manager.refresh_token(account_id)
+
+    def _is_inbox_job(self, entry) -> bool:
+        """Check if a listing entry is a job file anywhere under /Inbox/.
+
+        Args:
+            entry: Metadata entry from a folder listing
+
+        Returns:
+            True if the entry is a job file in the Inbox
+        """
+        # Runs for every entry of every listing page: exact type check and a
+        # single precompiled match instead of startswith plus a Path suffix
+        return type(entry) is FileMetadata and _match_job_file(entry.path_lower)
+
+    @refresh_on_auth_error(default=[])
+    def list_new_files(self, account_id: str) -> Iterator[FileMetadata]:
+        """List new .txt job files in the App Folder's Inbox (and its subfolders).
+
+        The first page is fetched before returning, so auth errors are
+        handled here; further pages are fetched lazily as the result is
+        consumed, letting callers start on early files while pagination
+        continues.
+
+        Args:
+            account_id: Dropbox account ID
+
+        Returns:
+            Iterator over new file metadata
         """
         dbx = self.get_dropbox_client(account_id)
 
@@ -101,42 +272,34 @@ class DropboxWatcher:
             return []
 
         try:
-            new_files = []
             cursor = self.cursors.get(account_id)
 
             if cursor:
                 # Get changes since last check
-                result = dbx.files_list_folder_continue(cursor)
-            else:
-                # First time - list all files in Inbox
-                result = dbx.files_list_folder("/Inbox", recursive=False)
-
-            # Update cursor for next time
-            self.cursors[account_id] = result.cursor
-
-            # Collect new .txt files from /Inbox/
-            for entry in result.entries:
-                if isinstance(entry, FileMetadata):
-                    if self.job_processor.is_job_file(entry.path_lower):
-                        new_files.append(entry)
-
-            # Handle pagination
-            while result.has_more:
-                result = dbx.files_list_folder_continue(result.cursor)
-                self.cursors[account_id] = result.cursor
+                try:
+                    result = dbx.files_list_folder_continue(cursor)
+                except ApiError as e:
+                    if not (
+                        isinstance(e.error, ListFolderContinueError)
+                        and e.error.is_reset()
+                    ):
+                        raise
+                    logger.info(f"Cursor reset for account {account_id}, relisting")
+                    cursor = None
+
+            if not cursor:
+                # First time - one recursive listing from the App Folder root,
+                # so a single cursor covers every folder
+                result = dbx.files_list_folder(
+                    "", recursive=True, include_deleted=False
+                )
 
-                for entry in result.entries:
-                    if isinstance(entry, FileMetadata):
-                        if self.job_processor.is_job_file(entry.path_lower):
-                            new_files.append(entry)
+            return self._iter_new_files(dbx, account_id, result)
 
-            return new_files
+        except AuthError:
+            raise
 
         except ApiError as e:
-            # Handle case where /Inbox doesn't exist yet
-            if "path/not_found" in str(e):
-                logger.debug(f"Inbox folder not found for account {account_id}")
-                return []
             logger.error(f"Dropbox API error for account {account_id}: {e}")
             return []
 
@@ -144,6 +307,39 @@ class DropboxWatcher:
             logger.error(f"Error listing files for account {account_id}: {e}")
             return []
 
+    def _iter_new_files(
+        self, dbx: dropbox.Dropbox, account_id: str, result
+    ) -> Iterator[FileMetadata]:
+        """Yield Inbox job files page by page, following pagination.
+
+        The account's cursor advances with each page, so if a later page
+        fails it still points just past the files already yielded.
+
+        Args:
+            dbx: Dropbox client
+            account_id: Dropbox account ID
+            result: First page of the listing
+
+        Yields:
+            New job file metadata
+        """
+        is_inbox_job = self._is_inbox_job
+
+        while True:
+            # Update cursor for next time
+            self.cursors[account_id] = result.cursor
+            yield from filter(is_inbox_job, result.entries)
+
+            if not result.has_more:
+                return
+
+            try:
+                result = dbx.files_list_folder_continue(result.cursor)
+            except Exception as e:
+                logger.error(f"Error listing files for account {account_id}: {e}")
+                return
+
+    @refresh_on_auth_error(default=False)
     def download_and_process_file(
         self, account_id: str, account_email: str, file_metadata: FileMetadata
     ) -> bool:
@@ -163,17 +359,25 @@ class DropboxWatcher:
             return False
 
         try:
+            # Create unique identifier for idempotency
+            file_identifier = f"dropbox:{account_id}:{file_metadata.id}"
+
+            # Replayed after a restart or cursor reset; don't download it again
+            if self.job_processor.is_already_processed(file_identifier):
+                logger.info(f"Job already processed, skipping: {file_metadata.name}")
+                return False
+
             # Download file
             logger.info(f"Downloading job file from Dropbox: {file_metadata.name}")
             metadata, response = dbx.files_download(file_metadata.path_lower)
-            job_content = response.content.decode("utf-8")
-
-            # Create unique identifier for idempotency
-            file_identifier = f"dropbox:{account_id}:{file_metadata.id}"
+            try:
+                job_content = self._read_job_content(response, file_metadata.size)
+            finally:
+                response.close()
 
             # Process job
             success, output_folder, video_id = self.job_processor.process_job_file(
-                job_content=job_content,
+                url=self.job_processor.parse_job_content(job_content),
                 job_filename=file_metadata.name,
                 job_identifier=file_identifier,
                 account_id=account_id,
@@ -189,12 +393,40 @@ class DropboxWatcher:
 
             return success
 
+        except AuthError:
+            raise
+
         except Exception as e:
             logger.error(
                 f"Error downloading/processing file {file_metadata.name}: {e}"
             )
             return False
 
+    @staticmethod
+    def _read_job_content(response, size: int) -> str:
+        """Decode a downloaded job file.
+
+        Small files are decoded in one shot. Larger ones are streamed and
+        decoded chunk by chunk, so the raw body is never held in memory
+        alongside the decoded text.
+
+        Args:
+            response: HTTP response from files_download
+            size: File size in bytes from the Dropbox metadata
+
+        Returns:
+            Job file content
+        """
+        if size < JOB_STREAM_THRESHOLD:
+            return response.content.decode("utf-8")
+
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        buffer = io.StringIO()
+        for chunk in response.raw.stream(JOB_STREAM_THRESHOLD, decode_content=True):
+            buffer.write(decoder.decode(chunk))
+        buffer.write(decoder.decode(b"", final=True))
+        return buffer.getvalue()
+
     def upload_output_folder(self, dbx: dropbox.Dropbox, folder_name: str) -> bool:
         """Upload output folder contents to Dropbox /Outbox/.
 
@@ -206,31 +438,39 @@ class DropboxWatcher:
             True if uploaded successfully
         """
         try:
-            from pathlib import Path
-
-            local_folder = Path(self.job_processor.outbox_dir) / folder_name
+            local_folder = self.job_processor.outbox_dir / folder_name
             dropbox_folder = f"/Outbox/{folder_name}"
 
             # Create folder in Dropbox
             try:
                 dbx.files_create_folder_v2(dropbox_folder)
             except ApiError as e:
-                if "conflict" not in str(e).lower():
+                # Already exists (e.g. a re-run of the same video)
+                if not (
+                    isinstance(e.error, CreateFolderError)
+                    and e.error.is_path()
+                    and e.error.get_path().is_conflict()
+                ):
                     raise
 
-            # Upload each file in the folder
+            # Upload each file's content into its own session, then commit
+            # them all with a single finish_batch call
+            upload = self._upload_file_content
+            overwrite = WriteMode.overwrite
+            entries = []
             for file_path in local_folder.iterdir():
                 if file_path.is_file():
-                    dropbox_path = f"{dropbox_folder}/{file_path.name}"
-
-                    with open(file_path, "rb") as f:
-                        dbx.files_upload(
-                            f.read(),
-                            dropbox_path,
-                            mode=dropbox.files.WriteMode.overwrite,
+                    entries.append(
+                        UploadSessionFinishArg(
+                            cursor=upload(dbx, file_path),
+                            commit=CommitInfo(
+                                path=f"{dropbox_folder}/{file_path.name}",
+                                mode=overwrite,
+                            ),
                         )
+                    )
 
-                    logger.debug(f"Uploaded to Dropbox: {dropbox_path}")
+            self._commit_uploads(dbx, entries)
 
             logger.info(f"Uploaded output folder to Dropbox: {dropbox_folder}")
             return True
@@ -239,6 +479,85 @@ class DropboxWatcher:
             logger.error(f"Error uploading output folder to Dropbox: {e}")
             return False
 
+    def _commit_uploads(
+        self, dbx: dropbox.Dropbox, entries: List[UploadSessionFinishArg]
+    ):
+        """Commit closed upload sessions with a single finish_batch call.
+
+        Args:
+            dbx: Dropbox client
+            entries: Session cursors and their commit info
+
+        Raises:
+            RuntimeError: If any entry failed to commit
+        """
+        if not entries:
+            return
+
+        result = dbx.files_upload_session_finish_batch_v2(entries)
+        for entry, arg in zip(result.entries, entries):
+            if entry.is_failure():
+                raise RuntimeError(
+                    f"Upload of {arg.commit.path} failed: {entry.get_failure()}"
+                )
+            logger.debug(f"Uploaded to Dropbox: {arg.commit.path}")
+
+    def _upload_file_content(
+        self, dbx: dropbox.Dropbox, file_path
+    ) -> UploadSessionCursor:
+        """Upload a file's content into a closed upload session.
+
+        Small files go up in a single request. Larger files (e.g. audio.mp3)
+        use a concurrent session whose chunks are appended in parallel.
+
+        Args:
+            dbx: Dropbox client
+            file_path: Local file to upload
+
+        Returns:
+            Cursor of the closed session, ready to be committed
+        """
+        size = file_path.stat().st_size
+
+        with open(file_path, "rb") as f:
+            if size <= UPLOAD_SINGLE_REQUEST_LIMIT:
+                data = f.read()
+                result = dbx.files_upload_session_start(data, close=True)
+                return UploadSessionCursor(session_id=result.session_id, offset=size)
+
+            session_id = dbx.files_upload_session_start(
+                b"", session_type=UploadSessionType.concurrent
+            ).session_id
+
+            # Map the file instead of reading it into memory; each worker
+            # slices its own chunk, so only in-flight chunks are held in RAM
+            # (the SDK needs bytes, so each slice is still one chunk copy)
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+
+                def append(offset: int, close: bool = False):
+                    dbx.files_upload_session_append_v2(
+                        mm[offset : offset + UPLOAD_CHUNK_SIZE],
+                        UploadSessionCursor(session_id=session_id, offset=offset),
+                        close=close,
+                    )
+
+                # Every chunk but the last is a multiple of 4 MiB, as
+                # concurrent sessions require; the last one closes the session
+                *body, last = range(0, size, UPLOAD_CHUNK_SIZE)
+
+                with ThreadPoolExecutor(
+                    max_workers=UPLOAD_CHUNK_WORKERS,
+                    thread_name_prefix="dropbox-upload",
+                ) as pool:
+                    list(pool.map(append, body))
+
+                append(last, close=True)
+            finally:
+                mm.close()
+
+        return UploadSessionCursor(session_id=session_id, offset=size)
+
     def move_to_archive(self, dbx: dropbox.Dropbox, file_metadata: FileMetadata) -> bool:
         """Move processed job file to /Archive/ folder.
 
@@ -265,10 +584,15 @@ class DropboxWatcher:
             logger.error(f"Error moving file to archive: {e}")
             return False
 
-    def initialize_folder_structure(self, account_id: str) -> bool:
+    @refresh_on_auth_error(default=False)
+    def initialize_folder_structure(
+        self, account_id: str, account_email: Optional[str] = None
+    ) -> bool:
         """Initialize required folder structure in Dropbox App Folder.
 
-        Creates:
+        Lists the root once, creates whatever folders are missing in one
+        batch and uploads default files that don't exist yet. Callers check
+        initialized_accounts first; this always talks to Dropbox. Creates:
         - /Inbox/ - For job files (YouTube URLs)
         - /Outbox/ - For processed notes and audio
         - /Archive/ - For processed job files
@@ -276,105 +600,128 @@ class DropboxWatcher:
 
         Args:
             account_id: Dropbox account ID
+            account_email: User's email, used for logging
 
         Returns:
             True if initialization successful
         """
-        if account_id in self.initialized_accounts:
-            return True
-
         dbx = self.get_dropbox_client(account_id)
 
         if not dbx:
             return False
 
-        folders_to_create = ["/Inbox", "/Outbox", "/Archive", "/Logs"]
-
         try:
-            for folder_path in folders_to_create:
-                try:
-                    dbx.files_create_folder_v2(folder_path)
-                    logger.info(f"Created folder: {folder_path}")
-                except ApiError as e:
-                    if "conflict" not in str(e).lower():
-                        logger.warning(f"Could not create folder {folder_path}: {e}")
-
-            # Create default tags.txt
-            default_tags = "\n".join(
-                [
-                    "education",
-                    "tutorial",
-                    "podcast",
-                    "interview",
-                    "documentary",
-                    "entertainment",
-                    "technology",
-                    "science",
-                    "business",
-                    "health",
-                ]
+            # One listing of the App Folder root tells us what already exists
+            result = dbx.files_list_folder("")
+            existing = {entry.path_lower for entry in result.entries}
+            while result.has_more:
+                result = dbx.files_list_folder_continue(result.cursor)
+                existing.update(entry.path_lower for entry in result.entries)
+
+            # Create all missing folders in one batch
+            missing_folders = [
+                folder for folder in APP_FOLDERS if folder.lower() not in existing
+            ]
+            if missing_folders and not self._create_folders(dbx, missing_folders):
+                # Not marked initialized, so the next start tries again
+                return False
+
+            # Upload default files that don't exist yet in one batch
+            missing_files = []
+            outbox_exists = "/outbox" in existing
+            if not outbox_exists or not self._exists(dbx, "/Outbox/tags.txt"):
+                missing_files.append(("/Outbox/tags.txt", DEFAULT_TAGS_TXT))
+            if "/readme.txt" not in existing:
+                missing_files.append(("/README.txt", README_TXT))
+
+            entries = []
+            for path, content in missing_files:
+                data = content.encode("utf-8")
+                session = dbx.files_upload_session_start(data, close=True)
+                entries.append(
+                    UploadSessionFinishArg(
+                        cursor=UploadSessionCursor(
+                            session_id=session.session_id, offset=len(data)
+                        ),
+                        commit=CommitInfo(path=path, mode=WriteMode.add),
+                    )
+                )
+            self._commit_uploads(dbx, entries)
+            for path, _ in missing_files:
+                logger.info(f"Created {path}")
+
+            self.initialized_accounts.add(account_id)
+            self.token_storage.update_state(account_id, initialized=True)
+
+            logger.info(
+                f"Initialized folder structure for: {account_email or account_id}"
             )
 
-            try:
-                dbx.files_upload(
-                    default_tags.encode("utf-8"),
-                    "/Outbox/tags.txt",
-                    mode=dropbox.files.WriteMode.add,
-                )
-                logger.info("Created default tags.txt")
-            except ApiError as e:
-                if "conflict" not in str(e).lower():
-                    logger.warning(f"Could not create tags.txt: {e}")
+            return True
 
-            # Create README
-            readme_content = """# VoxBox - Video to Obsidian Knowledge Pipeline
+        except AuthError:
+            raise
 
-This is your VoxBox App Folder. Here's how it works:
+        except Exception as e:
+            logger.error(f"Error initializing folder structure: {e}")
+            return False
 
-## Folder Structure
-- **/Inbox/** - Drop .txt files containing YouTube URLs here
-- **/Outbox/** - Processed notes and audio appear here
-- **/Archive/** - Processed job files are moved here
-- **/Logs/** - Processing logs
+    def _create_folders(self, dbx: dropbox.Dropbox, paths: List[str]) -> bool:
+        """Create folders with one create_folder_batch call.
 
-## Usage
-1. Create a .txt file with a YouTube URL (just paste the URL)
-2. Upload it to /Inbox/
-3. VoxBox processes it automatically
-4. Find your note in /Outbox/YYYY-MM-DD_Video_Title/
-   - audio.mp3 - The audio file
-   - Video_Title.md - Obsidian note with summary and transcript
+        Args:
+            dbx: Dropbox client
+            paths: Folder paths to create
 
-## Tags
-Edit /Outbox/tags.txt to customize available tags for categorization.
+        Returns:
+            True if every folder exists afterwards
+        """
+        status = dbx.files_create_folder_batch(paths)
+
+        # Small batches normally complete inline; otherwise wait for the job
+        if status.is_async_job_id():
+            job_id = status.get_async_job_id()
+            status = dbx.files_create_folder_batch_check(job_id)
+            while status.is_in_progress():
+                time.sleep(1)
+                status = dbx.files_create_folder_batch_check(job_id)
+
+        if not status.is_complete():
+            logger.warning(f"Could not create folders {paths}: {status}")
+            return False
 
----
-Powered by VoxBox - Video to Obsidian Knowledge Pipeline
-"""
+        created_all = True
+        for path, entry in zip(paths, status.get_complete().entries):
+            if entry.is_success():
+                logger.info(f"Created folder: {path}")
+                continue
+            # A conflict means the folder appeared since the listing
+            error = entry.get_failure()
+            if error.is_path() and error.get_path().is_conflict():
+                continue
+            logger.warning(f"Could not create folder {path}: {error}")
+            created_all = False
 
-            try:
-                dbx.files_upload(
-                    readme_content.encode("utf-8"),
-                    "/README.txt",
-                    mode=dropbox.files.WriteMode.add,
-                )
-                logger.info("Created README.txt")
-            except ApiError:
-                pass
+        return created_all
 
-            self.initialized_accounts.add(account_id)
+    @staticmethod
+    def _exists(dbx: dropbox.Dropbox, path: str) -> bool:
+        """Check whether a path exists in the App Folder.
 
-            token_data = self.token_storage.load_token(account_id)
-            account_email = (
-                token_data.get("account_email", account_id) if token_data else account_id
-            )
-            logger.info(f"Initialized folder structure for: {account_email}")
+        Args:
+            dbx: Dropbox client
+            path: Dropbox path
 
+        Returns:
+            True if the path exists
+        """
+        try:
+            dbx.files_get_metadata(path)
             return True
-
-        except Exception as e:
-            logger.error(f"Error initializing folder structure: {e}")
-            return False
+        except ApiError as e:
+            if e.error.is_path() and e.error.get_path().is_not_found():
+                return False
+            raise
 
     def process_account(self, account_id: str) -> int:
         """Process all new job files for a single account.
@@ -393,58 +740,213 @@ Powered by VoxBox - Video to Obsidian Knowledge Pipeline
 
         account_email = token_data.get("account_email", account_id)
 
-        # Initialize folder structure on first poll
+        # Initialize folder structure on first poll (set.add of a str is
+        # atomic, so concurrent account threads need no extra lock)
         if account_id not in self.initialized_accounts:
-            self.initialize_folder_structure(account_id)
+            self.initialize_folder_structure(account_id, account_email)
+
+        processed_count = self._process_files(
+            account_id, account_email, self.list_new_files(account_id)
+        )
+
+        # Only now is it safe for a restart to resume past these files.
+        # Files whose job failed are behind the cursor from here on; they
+        # are picked up again by retry_inbox on the next start.
+        self._persist_cursor(account_id)
+
+        return processed_count
+
+    def _process_files(
+        self, account_id: str, account_email: str, files: Iterable[FileMetadata]
+    ) -> int:
+        """Process job files concurrently and wait for all of them.
 
-        # List new files
-        new_files = self.list_new_files(account_id)
+        Each file is submitted as soon as it is produced, so processing
+        starts while later listing pages are still being fetched.
 
-        if not new_files:
+        Args:
+            account_id: Dropbox account ID
+            account_email: User's email
+            files: Job file metadata
+
+        Returns:
+            Number of files processed
+        """
+        futures = {
+            self._file_pool.submit(
+                self.download_and_process_file, account_id, account_email, file_metadata
+            ): file_metadata
+            for file_metadata in files
+        }
+
+        if not futures:
             return 0
 
-        logger.info(f"Found {len(new_files)} new job file(s) for {account_email}")
+        logger.info(f"Found {len(futures)} new job file(s) for {account_email}")
 
-        # Process each file
         processed_count = 0
-        for file_metadata in new_files:
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
             try:
-                if self.download_and_process_file(
-                    account_id, account_email, file_metadata
-                ):
+                if future.result():
                     processed_count += 1
             except Exception as e:
-                logger.error(f"Error processing file {file_metadata.name}: {e}")
+                logger.error(f"Error processing file {futures[future].name}: {e}")
 
         return processed_count
 
-    def poll_once(self) -> int:
-        """Poll all accounts once for new files.
+    @refresh_on_auth_error(default=0)
+    def retry_inbox(self, account_id: str) -> int:
+        """Retry job files still in the Inbox from a previous run.
+
+        The saved cursor resumes past every file seen before, including
+        ones whose job failed (successful ones were moved to the Archive).
+        A full Inbox listing on startup finds those again; files with a
+        success row are skipped by download_and_process_file.
+
+        Args:
+            account_id: Dropbox account ID
 
         Returns:
-            Total number of files processed
+            Number of files processed
         """
-        accounts = self.token_storage.list_accounts()
+        dbx = self.get_dropbox_client(account_id)
+        token_data = self.token_storage.load_token(account_id)
+        if not dbx or not token_data:
+            return 0
 
-        if not accounts:
-            logger.debug("No authorized accounts to poll")
+        account_email = token_data.get("account_email", account_id)
+
+        def iter_inbox(result) -> Iterator[FileMetadata]:
+            while True:
+                yield from filter(self._is_inbox_job, result.entries)
+                if not result.has_more:
+                    return
+                try:
+                    result = dbx.files_list_folder_continue(result.cursor)
+                except Exception as e:
+                    logger.error(f"Error listing Inbox for account {account_id}: {e}")
+                    return
+
+        # First page fetched here, so auth errors reach the decorator before
+        # any file is submitted
+        try:
+            result = dbx.files_list_folder("/Inbox", recursive=True)
+        except AuthError:
+            raise
+        except Exception as e:
+            logger.error(f"Error listing Inbox for account {account_id}: {e}")
             return 0
 
-        logger.debug(f"Polling {len(accounts)} account(s) for new job files...")
+        return self._process_files(account_id, account_email, iter_inbox(result))
+
+    def _persist_cursor(self, account_id: str):
+        """Save an account's current cursor if it changed since the last save.
+
+        Args:
+            account_id: Dropbox account ID
+        """
+        cursor = self.cursors.get(account_id)
+        if cursor and cursor != self._saved_cursors.get(account_id):
+            self.token_storage.save_cursor(account_id, cursor)
+            self._saved_cursors[account_id] = cursor
+
+    def _is_watched(self, account_id: str) -> bool:
+        """Check whether an account's watcher should keep running.
+
+        Args:
+            account_id: Dropbox account ID
+
+        Returns:
+            False once the watcher is stopping or the account was removed
+        """
+        if self._stop_event.is_set():
+            return False
+        if not self.token_storage.load_token(account_id):
+            logger.info(f"Stopped watching removed account {account_id}")
+            return False
+        return True
 
-        total_processed = 0
-        for account_id in accounts:
+    def watch_account(self, account_id: str):
+        """Process an account's job files as they arrive (blocking).
+
+        Lists the Inbox once to establish a cursor, then waits on Dropbox's
+        longpoll endpoint, which returns as soon as the cursor has changes.
+        Only then are the changes listed and processed.
+
+        Args:
+            account_id: Dropbox account ID
+        """
+        # Resuming from a saved cursor skips files that failed last run
+        if self.cursors.get(account_id) and self._is_watched(account_id):
+            self.retry_inbox(account_id)
+
+        # One idle thread per account blocked in longpoll; it exits once the
+        # account is deauthorized, so removed accounts don't pin threads
+        while self._is_watched(account_id):
             try:
-                count = self.process_account(account_id)
-                total_processed += count
-            except Exception as e:
-                logger.error(f"Error polling account {account_id}: {e}")
+                if not self.cursors.get(account_id):
+                    # First pass: process the backlog and obtain a cursor
+                    self.process_account(account_id)
+                    if not self.cursors.get(account_id):
+                        self._stop_event.wait(self.poll_interval)
+                    continue
+
+                dbx = self.get_dropbox_client(account_id)
+                if not dbx:
+                    self._stop_event.wait(self.poll_interval)
+                    continue
+
+                result = dbx.files_list_folder_longpoll(
+                    self.cursors[account_id], timeout=LONGPOLL_TIMEOUT
+                )
 
-        return total_processed
+                if result.changes:
+                    self.process_account(account_id)
+
+                # Dropbox asks clients to wait before the next longpoll
+                if result.backoff:
+                    self._stop_event.wait(result.backoff)
+
+            except ApiError as e:
+                if e.error.is_reset():
+                    # Cursor expired; start over with a fresh listing
+                    logger.info(f"Cursor reset for account {account_id}")
+                    self.cursors.pop(account_id, None)
+                    self._saved_cursors.pop(account_id, None)
+                    self.token_storage.save_cursor(account_id, None)
+                else:
+                    logger.error(f"Longpoll error for account {account_id}: {e}")
+                    self._stop_event.wait(self.poll_interval)
+
+            except Exception as e:
+                logger.error(f"Error watching account {account_id}: {e}")
+                self._stop_event.wait(self.poll_interval)
+
+    def _start_account_watchers(self):
+        """Start a longpoll thread for each account that doesn't have one."""
+        for account_id in self.token_storage.list_accounts():
+            thread = self._account_threads.get(account_id)
+            if thread and thread.is_alive():
+                continue
+
+            thread = threading.Thread(
+                target=self.watch_account,
+                args=(account_id,),
+                name=f"dropbox-{account_id}",
+                daemon=True,
+            )
+            thread.start()
+            self._account_threads[account_id] = thread
+            logger.debug(f"Started longpoll watcher for account {account_id}")
 
     def run(self):
         """Run the watcher (blocking)."""
-        logger.info(f"Started Dropbox watcher (polling every {self.poll_interval}s)")
+        logger.info(
+            f"Started Dropbox watcher (longpolling, checking for new accounts "
+            f"every {self.poll_interval}s)"
+        )
 
         accounts = self.token_storage.list_accounts()
         if not accounts:
@@ -456,13 +958,25 @@ Powered by VoxBox - Video to Obsidian Knowledge Pipeline
             logger.info(f"Monitoring {len(accounts)} authorized account(s)")
 
         try:
-            while True:
-                self.poll_once()
-                time.sleep(self.poll_interval)
+            # Accounts can be authorized while running, so keep looking for
+            # ones without a watcher
+            while not self._stop_event.is_set():
+                self._start_account_watchers()
+                self._stop_event.wait(self.poll_interval)
 
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
         except Exception as e:
             logger.error(f"Watcher error: {e}")
             raise
-
+        finally:
+            self._stop_event.set()
+
+    def stop(self):
+        """Stop the watcher and its account threads."""
+        self._stop_event.set()
+        # Let running jobs finish before their session and the job
+        # processor go away; queued ones are dropped and retried on restart
+        self._file_pool.shutdown(wait=True, cancel_futures=True)
+        self._http.close()
+        logger.info("Stopped Dropbox watcher")
@@ -1,15 +1,217 @@
 """Gemini API client for video summarization and tagging."""
 
+import asyncio
+import hashlib
 import logging
+import os
 import time
 import json
-from typing import Optional, Dict, Any, List
+import random
+import re
+import threading
+from pathlib import Path
+from string import Template
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
 logger = logging.getLogger(__name__)
 
+# Transcript characters sent to Gemini per analysis
+MAX_TRANSCRIPT_CHARS = 15000
+
+# Upper bound in seconds for a single retry backoff
+MAX_RETRY_DELAY = 60
+
+# Response cache bounds: entries expire after this many days, at most this
+# many are kept, and the cache is pruned again after this many new entries
+CACHE_MAX_AGE_DAYS = 30
+CACHE_MAX_ENTRIES = 500
+CACHE_PRUNE_INTERVAL = 50
+
+# Errors worth retrying: rate limits, transient server-side failures and
+# dropped connections. Anything else (bad request, auth, safety) fails fast.
+RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    ConnectionError,
+    TimeoutError,
+)
+
+# Summary of the placeholder analysis used when Gemini's answer is unusable
+FALLBACK_SUMMARY = "Unable to generate summary."
+
+# Outermost {...} span of a response
+JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Analysis prompt; only the per-video fields are substituted per call
+ANALYSIS_PROMPT = Template(
+    """Analyze this video transcript and provide a structured summary.
+
+VIDEO INFORMATION:
+- Title: $video_title
+- Channel: $channel
+- Duration: $duration
+
+TRANSCRIPT:
+$transcript
+
+---
+
+Return a JSON response with:
+
+1. "title": A clean, descriptive title for the note (use the video title as base, clean up clickbait if present, max 60 chars)
+
+2. "summary": A 2-3 paragraph summary of the main content. Be specific about what is discussed. Write in clear, engaging prose.
+
+3. "key_takeaways": An array of 3-5 key points or insights from the video. Each should be actionable or memorable.
+
+4. "tags": Select 2-3 most appropriate tags from this list: [$tags]
+   Return as array with confidence scores:
+   [
+     {"name": "tag_name", "confidence": 0-100, "primary": true/false}
+   ]
+   Rules:
+   - Mark ONE tag as primary (highest confidence)
+   - Primary tag confidence should be ≥ 80%
+   - If no tag fits well, use "uncategorized"
+
+5. "topics": An array of 3-5 specific topics or themes discussed (these can be new, not from the tag list)
+
+Return ONLY valid JSON, no other text."""
+)
+
+
+class GeminiResponseCache:
+    """On-disk cache of parsed analyses, keyed by a hash of model and prompt.
+
+    Reprocessing a video (after an error, or a resubmitted URL) with the
+    same transcript and tag list reuses the earlier analysis instead of
+    paying for the request again. Entries older than CACHE_MAX_AGE_DAYS, and
+    the oldest beyond CACHE_MAX_ENTRIES, are evicted.
+    """
+
+    def __init__(self, cache_dir: str):
+        """Initialize response cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per cached analysis
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._puts_since_prune = 0
+        self.prune()
+
+    def prune(
+        self,
+        max_age_days: int = CACHE_MAX_AGE_DAYS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ) -> int:
+        """Delete expired entries, then the oldest beyond max_entries.
+
+        Args:
+            max_age_days: Age in days after which an entry is deleted
+            max_entries: Number of newest entries to keep
+
+        Returns:
+            Number of entries deleted
+        """
+        cutoff_time = time.time() - (max_age_days * 24 * 60 * 60)
+        entries = []
+        deleted_count = 0
+
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        mtime = entry.stat().st_mtime
+                        if mtime < cutoff_time:
+                            os.unlink(entry.path)
+                            deleted_count += 1
+                        else:
+                            entries.append((mtime, entry.path))
+                    except OSError:
+                        continue
+
+            if len(entries) > max_entries:
+                entries.sort()
+                for _, path in entries[: len(entries) - max_entries]:
+                    try:
+                        os.unlink(path)
+                        deleted_count += 1
+                    except OSError:
+                        continue
+
+            if deleted_count > 0:
+                logger.info(f"Evicted {deleted_count} Gemini cache entries")
+
+        except Exception as e:
+            logger.error(f"Error pruning Gemini cache: {e}")
+
+        return deleted_count
+
+    @staticmethod
+    def key(model_name: str, prompt: str) -> str:
+        """Build the cache key for a request.
+
+        Args:
+            model_name: Gemini model name
+            prompt: Fully rendered prompt
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256(model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a cached analysis.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Analysis dictionary or None if not cached
+        """
+        try:
+            return json.loads((self.cache_dir / f"{key}.json").read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Gemini cache entry {key}: {e}")
+            return None
+
+    def put(self, key: str, analysis: Dict[str, Any]):
+        """Store an analysis (written atomically).
+
+        Args:
+            key: Cache key
+            analysis: Parsed analysis dictionary
+        """
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            payload = json.dumps(analysis, ensure_ascii=False).encode("utf-8")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not cache Gemini response: {e}")
+            return
+
+        # Keep a long-running service bounded between restarts
+        self._puts_since_prune += 1
+        if self._puts_since_prune >= CACHE_PRUNE_INTERVAL:
+            self._puts_since_prune = 0
+            self.prune()
+
 
 class GeminiClient:
     """Client for Gemini API video summarization operations."""
@@ -20,6 +222,7 @@ class GeminiClient:
         model_name: str = "gemini-2.5-flash",
         max_retries: int = 3,
         retry_delay: int = 2,
+        cache_dir: Optional[str] = None,
     ):
         """Initialize Gemini client.
 
@@ -28,11 +231,19 @@ class GeminiClient:
             model_name: Model to use
             max_retries: Maximum number of retry attempts
             retry_delay: Initial retry delay in seconds
+            cache_dir: Directory for cached analyses (no caching if None)
         """
         self.api_key = api_key
         self.model_name = model_name
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.response_cache = GeminiResponseCache(cache_dir) if cache_dir else None
+
+        # Monotonic time before which no request is sent. Set when Gemini
+        # rate-limits us, so every worker backs off together instead of each
+        # one hammering the quota on its own schedule.
+        self._cooldown_until = 0.0
+        self._cooldown_lock = threading.Lock()
 
         # Configure API
         genai.configure(api_key=api_key)
@@ -73,64 +284,126 @@ class GeminiClient:
         Raises:
             Exception: If analysis fails after all retries
         """
+        # Build the prompt once; retries resend the same text
+        prompt = self._build_prompt(
+            transcript, video_title, channel, available_tags, duration_seconds
+        )
+
+        cache_key, cached = self._cached_analysis(prompt)
+        if cached is not None:
+            logger.info(f"Using cached analysis for: {video_title}")
+            return cached
+
         attempt = 0
         last_error = None
 
         while attempt < self.max_retries:
             try:
-                # Build prompt
-                tags_str = ", ".join(available_tags)
-                duration_str = self._format_duration(duration_seconds)
+                wait = self._cooldown_remaining()
+                if wait > 0:
+                    time.sleep(wait)
 
-                prompt = f"""Analyze this video transcript and provide a structured summary.
+                # Generate content
+                logger.debug(
+                    f"Sending analysis request for '{video_title}' "
+                    f"(attempt {attempt + 1}/{self.max_retries})"
+                )
 
-VIDEO INFORMATION:
-- Title: {video_title}
-- Channel: {channel}
-- Duration: {duration_str}
+                response = self.model.generate_content(
+                    prompt,
+                    safety_settings=self.safety_settings,
+                )
 
-TRANSCRIPT:
-{transcript[:15000]}  # Limit transcript length for API
+                # Parse response
+                if response.text:
+                    result = self._parse_response(response.text, available_tags)
+                    logger.info(f"Successfully analyzed video: {video_title}")
+                    self._store_analysis(cache_key, result)
+                    return result
+                else:
+                    logger.warning(f"Empty response from Gemini for {video_title}")
+                    return self._fallback_response(video_title)
 
----
+            except Exception as e:
+                last_error = e
+                attempt += 1
 
-Return a JSON response with:
+                if attempt < self.max_retries and isinstance(e, RETRYABLE_ERRORS):
+                    delay = self._backoff(attempt, e)
+                    logger.warning(
+                        f"Analysis attempt {attempt} failed for '{video_title}': {e}. "
+                        f"Retrying in {delay:.1f}s..."
+                    )
+                    time.sleep(delay)
+                else:
+                    logger.error(
+                        f"All analysis attempts failed for '{video_title}': {e}"
+                    )
+                    break
 
-1. "title": A clean, descriptive title for the note (use the video title as base, clean up clickbait if present, max 60 chars)
+        # All retries exhausted
+        raise Exception(
+            f"Failed to analyze video after {attempt} attempts: {last_error}"
+        )
 
-2. "summary": A 2-3 paragraph summary of the main content. Be specific about what is discussed. Write in clear, engaging prose.
+    async def analyze_video_async(
+        self,
+        transcript: str,
+        video_title: str,
+        channel: str,
+        available_tags: List[str],
+        duration_seconds: int = 0,
+    ) -> Dict[str, Any]:
+        """Async variant of analyze_video.
 
-3. "key_takeaways": An array of 3-5 key points or insights from the video. Each should be actionable or memorable.
+        Backoff between retries awaits instead of sleeping, so other
+        analyses keep running while this one waits.
 
-4. "tags": Select 2-3 most appropriate tags from this list: [{tags_str}]
-   Return as array with confidence scores:
-   [
-     {{"name": "tag_name", "confidence": 0-100, "primary": true/false}}
-   ]
-   Rules:
-   - Mark ONE tag as primary (highest confidence)
-   - Primary tag confidence should be ≥ 80%
-   - If no tag fits well, use "uncategorized"
+        Args:
+            transcript: Full video transcript
+            video_title: Original video title
+            channel: Channel name
+            available_tags: List of available tags for categorization
+            duration_seconds: Video duration in seconds
 
-5. "topics": An array of 3-5 specific topics or themes discussed (these can be new, not from the tag list)
+        Returns:
+            Dictionary with title, summary, key_takeaways, and tags
 
-Return ONLY valid JSON, no other text."""
+        Raises:
+            Exception: If analysis fails after all retries
+        """
+        prompt = self._build_prompt(
+            transcript, video_title, channel, available_tags, duration_seconds
+        )
+
+        cache_key, cached = self._cached_analysis(prompt)
+        if cached is not None:
+            logger.info(f"Using cached analysis for: {video_title}")
+            return cached
+
+        attempt = 0
+        last_error = None
+
+        while attempt < self.max_retries:
+            try:
+                wait = self._cooldown_remaining()
+                if wait > 0:
+                    await asyncio.sleep(wait)
 
-                # Generate content
                 logger.debug(
                     f"Sending analysis request for '{video_title}' "
                     f"(attempt {attempt + 1}/{self.max_retries})"
                 )
 
-                response = self.model.generate_content(
+                response = await self.model.generate_content_async(
                     prompt,
                     safety_settings=self.safety_settings,
                 )
 
-                # Parse response
                 if response.text:
                     result = self._parse_response(response.text, available_tags)
                     logger.info(f"Successfully analyzed video: {video_title}")
+                    self._store_analysis(cache_key, result)
                     return result
                 else:
                     logger.warning(f"Empty response from Gemini for {video_title}")
@@ -140,21 +413,135 @@ Return ONLY valid JSON, no other text."""
                 last_error = e
                 attempt += 1
 
-                if attempt < self.max_retries:
-                    delay = self.retry_delay * (2 ** (attempt - 1))
+                if attempt < self.max_retries and isinstance(e, RETRYABLE_ERRORS):
+                    delay = self._backoff(attempt, e)
                     logger.warning(
                         f"Analysis attempt {attempt} failed for '{video_title}': {e}. "
-                        f"Retrying in {delay}s..."
+                        f"Retrying in {delay:.1f}s..."
                     )
-                    time.sleep(delay)
+                    await asyncio.sleep(delay)
                 else:
                     logger.error(
                         f"All analysis attempts failed for '{video_title}': {e}"
                     )
+                    break
 
-        # All retries exhausted
         raise Exception(
-            f"Failed to analyze video after {self.max_retries} attempts: {last_error}"
+            f"Failed to analyze video after {attempt} attempts: {last_error}"
+        )
+
+    async def analyze_videos_batch(
+        self, jobs: List[Dict[str, Any]], max_concurrent: int = 8
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Analyze several videos concurrently.
+
+        Must be awaited from a single long-lived event loop: the async Gemini
+        transport is bound to the loop it was first used on.
+
+        Args:
+            jobs: List of keyword-argument dicts for analyze_video_async
+            max_concurrent: Maximum number of requests in flight
+
+        Returns:
+            Results in the same order as jobs; a failed analysis yields its
+            exception instead of a dictionary
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def run(job: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_video_async(**job)
+
+        return await asyncio.gather(*(run(job) for job in jobs), return_exceptions=True)
+
+    def _cached_analysis(
+        self, prompt: str
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Look up a prompt in the response cache.
+
+        Args:
+            prompt: Fully rendered prompt
+
+        Returns:
+            Tuple of (cache key, cached analysis); both None without a cache
+        """
+        if self.response_cache is None:
+            return None, None
+        key = self.response_cache.key(self.model_name, prompt)
+        return key, self.response_cache.get(key)
+
+    def _store_analysis(self, cache_key: Optional[str], result: Dict[str, Any]):
+        """Cache a parsed analysis unless it is the fallback placeholder.
+
+        Args:
+            cache_key: Key from _cached_analysis (None without a cache)
+            result: Parsed analysis
+        """
+        if cache_key and result.get("summary") != FALLBACK_SUMMARY:
+            self.response_cache.put(cache_key, result)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Pick the delay before the next attempt.
+
+        Uses exponential backoff with full jitter, so concurrent workers
+        that failed together don't retry in lockstep. A rate-limit error
+        also starts a shared cooldown that holds back every other request.
+
+        Args:
+            attempt: Number of attempts made so far
+            error: Error raised by the last attempt
+
+        Returns:
+            Seconds to wait
+        """
+        cap = min(MAX_RETRY_DELAY, self.retry_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(0, cap)
+
+        if isinstance(error, google_exceptions.TooManyRequests):
+            # Wait out at least the full window, then leave the shared
+            # cooldown at the latest point any worker asked for
+            delay = cap
+            with self._cooldown_lock:
+                self._cooldown_until = max(
+                    self._cooldown_until, time.monotonic() + delay
+                )
+
+        return delay
+
+    def _cooldown_remaining(self) -> float:
+        """Seconds left in the shared rate-limit cooldown.
+
+        Returns:
+            Remaining cooldown (zero or negative when none is active)
+        """
+        return self._cooldown_until - time.monotonic()
+
+    def _build_prompt(
+        self,
+        transcript: str,
+        video_title: str,
+        channel: str,
+        available_tags: List[str],
+        duration_seconds: int,
+    ) -> str:
+        """Render the analysis prompt for one video.
+
+        Args:
+            transcript: Full video transcript
+            video_title: Original video title
+            channel: Channel name
+            available_tags: List of available tags for categorization
+            duration_seconds: Video duration in seconds
+
+        Returns:
+            Prompt text
+        """
+        return ANALYSIS_PROMPT.substitute(
+            video_title=video_title,
+            channel=channel,
+            duration=self._format_duration(duration_seconds),
+            transcript=self._truncate_transcript(transcript),
+            tags=", ".join(available_tags),
         )
 
     def _parse_response(
@@ -170,20 +557,14 @@ Return ONLY valid JSON, no other text."""
             Validated response dictionary
         """
         try:
-            # Clean up response (remove markdown code blocks if present)
-            json_str = response_text.strip()
-
-            if json_str.startswith("```json"):
-                json_str = json_str[7:]
-            if json_str.startswith("```"):
-                json_str = json_str[3:]
-            if json_str.endswith("```"):
-                json_str = json_str[:-3]
-
-            json_str = json_str.strip()
+            # Locate the JSON object, ignoring code fences or surrounding prose
+            match = JSON_OBJECT_RE.search(response_text)
+            if not match:
+                logger.warning("No JSON object found in response")
+                return self._fallback_response("Unknown")
 
             # Parse JSON
-            data = json.loads(json_str)
+            data = json.loads(match.group(0))
 
             # Validate required fields
             required = ["title", "summary", "key_takeaways", "tags"]
@@ -241,12 +622,36 @@ Return ONLY valid JSON, no other text."""
         """
         return {
             "title": title,
-            "summary": "Unable to generate summary.",
+            "summary": FALLBACK_SUMMARY,
             "key_takeaways": ["Summary generation failed."],
             "tags": [{"name": "uncategorized", "confidence": 100, "primary": True}],
             "topics": [],
         }
 
+    @staticmethod
+    def _truncate_transcript(transcript: str) -> str:
+        """Limit transcript length for the API.
+
+        Cuts at the last line break (or space) before the limit, so the
+        prompt never ends mid-word or mid-timestamp.
+
+        Args:
+            transcript: Full video transcript
+
+        Returns:
+            Transcript of at most MAX_TRANSCRIPT_CHARS characters
+        """
+        if len(transcript) <= MAX_TRANSCRIPT_CHARS:
+            return transcript
+
+        cut = transcript.rfind("\n", 0, MAX_TRANSCRIPT_CHARS + 1)
+        if cut < MAX_TRANSCRIPT_CHARS // 2:
+            cut = transcript.rfind(" ", 0, MAX_TRANSCRIPT_CHARS + 1)
+        if cut <= 0:
+            cut = MAX_TRANSCRIPT_CHARS
+
+        return transcript[:cut]
+
     @staticmethod
     def _format_duration(seconds: int) -> str:
         """Format duration in human-readable form."""
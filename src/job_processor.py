@@ -1,11 +1,16 @@
 """Main job processing pipeline for VoxBox."""
 
+import asyncio
 import logging
+import os
+import re
 import shutil
+import threading
 import time
 import traceback
+import weakref
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Awaitable, Optional, Tuple, TypeVar
 
 from .url_parser import URLParser
 from .audio_downloader import AudioDownloader, DownloadResult
@@ -19,10 +24,51 @@ from .log_writer import LogWriter
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Linux FICLONE ioctl: share the source file's extents (reflink on btrfs/XFS)
+FICLONE = 0x40049409
+
+
+def _fast_copy(src: Path, dst: Path):
+    """Copy a file without moving its bytes through Python when possible.
+
+    Tries a hardlink (same filesystem), then a reflink, then falls back to
+    shutil.copy2. The downloaded source is only ever deleted, never
+    modified, so sharing its data with the outbox copy is safe.
+
+    Args:
+        src: Source file
+        dst: Destination file (must not exist)
+    """
+    try:
+        if src.stat().st_dev == dst.parent.stat().st_dev:
+            os.link(src, dst)
+            return
+    except OSError:
+        pass
+
+    try:
+        import fcntl
+
+        # "xb": never truncate an existing file another job may share
+        with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+        return
+    except (ImportError, OSError):
+        pass
+
+    shutil.copy2(src, dst)
+
 
 class JobProcessor:
     """Processes video jobs through the complete pipeline."""
 
+    # Job files in a Dropbox Inbox (or its subfolders), matched against the
+    # lowercased path Dropbox returns in listings
+    JOB_FILE_RE = re.compile(r"/inbox/.+\.txt")
+
     def __init__(
         self,
         gemini_client: GeminiClient,
@@ -49,7 +95,14 @@ class JobProcessor:
             temp_dir=config.temp_dir,
             audio_quality=config.audio_quality,
         )
-        self.transcriber = Transcriber(whisper_model=config.whisper_model)
+        self.transcriber = Transcriber(
+            whisper_model=config.whisper_model,
+            device=config.whisper_device,
+            compute_type=config.whisper_compute_type,
+            beam_size=config.whisper_beam_size,
+            vad_filter=config.whisper_vad_filter,
+            num_workers=config.max_concurrent_jobs,
+        )
         self.tag_manager = TagManager(
             outbox_dir=config.outbox_dir,
             enable_learning=config.enable_tag_learning,
@@ -60,12 +113,129 @@ class JobProcessor:
             enabled=config.enable_detailed_logs,
         )
 
-        self.outbox_dir = Path(config.outbox_dir)
-        self.archive_dir = Path(config.archive_dir)
+        self.outbox_dir = config.outbox_dir
+        self.archive_dir = config.archive_dir
+
+        # Jobs run as coroutines on one long-lived event loop in a background
+        # thread, so jobs submitted from different watcher threads overlap
+        # their network waits. A single loop also keeps the async Gemini
+        # transport, which binds to the loop it first runs on, valid.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        # Threads waiting in _run; close() stops the loop only once none are
+        # left, so no caller blocks forever on a coroutine that never runs
+        self._active_runs = 0
+        self._runs_done = threading.Condition(self._loop_lock)
+        self._job_slots = asyncio.Semaphore(config.max_concurrent_jobs)
+
+        # One lock per video being processed: jobs for the same video share
+        # its temp directory and output note, so they run one after another
+        # (the second then finds the first's note and skips as a duplicate).
+        # Only touched from the loop thread; entries vanish once unused.
+        self._video_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def _run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the processor's event loop and wait for it.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="job-processor-loop",
+                    daemon=True,
+                ).start()
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+            self._active_runs += 1
+
+        try:
+            return future.result()
+        finally:
+            with self._loop_lock:
+                self._active_runs -= 1
+                self._runs_done.notify_all()
+
+    def close(self):
+        """Release pipeline resources.
+
+        Waits for running jobs, then stops the event loop, the download
+        pool, Whisper, the notification providers' connections and the
+        processed files database.
+        """
+        with self._loop_lock:
+            self._runs_done.wait_for(lambda: self._active_runs == 0)
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+        self.audio_downloader.close()
+        self.transcriber.close()
+        self.notification_manager.close()
+        self.log_writer.flush()
+        self.processed_db.close()
+
+    def parse_job_content(self, job_content: str) -> Optional[str]:
+        """Extract the YouTube URL from a job file's content.
+
+        Watchers call this right after reading a job file, so only the URL
+        is passed down the pipeline. Unparseable content is logged here,
+        since the pipeline never sees it.
+
+        Args:
+            job_content: Content of the job file
+
+        Returns:
+            YouTube URL, or None if the file doesn't contain one
+        """
+        url = self.url_parser.parse_job_file(job_content)
+        if not url:
+            logger.warning(f"Unparseable job file content: {job_content[:100]!r}")
+        return url
 
     def process_job_file(
         self,
-        job_content: str,
+        url: Optional[str],
+        job_filename: str,
+        job_identifier: str,
+        account_id: Optional[str] = None,
+        account_email: Optional[str] = None,
+    ) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Process a job file containing a YouTube URL.
+
+        Blocking wrapper around process_job_file_async for watcher threads.
+        Calls from several threads run concurrently on the shared loop.
+
+        Args:
+            url: YouTube URL parsed from the job file (None if there was none)
+            job_filename: Original job filename
+            job_identifier: Unique identifier for idempotency
+            account_id: Dropbox account ID (if applicable)
+            account_email: User's email (if applicable)
+
+        Returns:
+            Tuple of (success, output_folder_name, video_id)
+        """
+        return self._run(
+            self.process_job_file_async(
+                url=url,
+                job_filename=job_filename,
+                job_identifier=job_identifier,
+                account_id=account_id,
+                account_email=account_email,
+            )
+        )
+
+    async def process_job_file_async(
+        self,
+        url: Optional[str],
         job_filename: str,
         job_identifier: str,
         account_id: Optional[str] = None,
@@ -73,8 +243,12 @@ class JobProcessor:
     ) -> Tuple[bool, Optional[str], Optional[str]]:
         """Process a job file containing a YouTube URL.
 
+        Blocking stages (yt-dlp, Whisper, file copies, notifications) run in
+        worker threads and Gemini is awaited natively, so up to
+        max_concurrent_jobs jobs overlap their I/O.
+
         Args:
-            job_content: Content of the job file (YouTube URL)
+            url: YouTube URL parsed from the job file (None if there was none)
             job_filename: Original job filename
             job_identifier: Unique identifier for idempotency
             account_id: Dropbox account ID (if applicable)
@@ -83,18 +257,30 @@ class JobProcessor:
         Returns:
             Tuple of (success, output_folder_name, video_id)
         """
+        async with self._job_slots:
+            return await self._process_job(
+                url, job_filename, job_identifier, account_id, account_email
+            )
+
+    async def _process_job(
+        self,
+        url: Optional[str],
+        job_filename: str,
+        job_identifier: str,
+        account_id: Optional[str],
+        account_email: Optional[str],
+    ) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Run the pipeline for one job; see process_job_file_async."""
         start_time = time.time()
         video_id = None
-        url = None
+        video_lock = None
 
         try:
             # Check if already processed
-            if self.processed_db.is_processed(job_identifier):
+            if await asyncio.to_thread(self.is_already_processed, job_identifier):
                 logger.info(f"Job already processed, skipping: {job_filename}")
                 return False, None, None
 
-            # Parse URL from job content
-            url = self.url_parser.parse_job_file(job_content)
             if not url:
                 raise ValueError(f"No valid YouTube URL found in job file: {job_filename}")
 
@@ -102,11 +288,47 @@ class JobProcessor:
             if not video_id:
                 raise ValueError(f"Could not extract video ID from URL: {url}")
 
+            lock = self._video_locks.setdefault(video_id, asyncio.Lock())
+            await lock.acquire()
+            video_lock = lock
+
+            # Another job may have finished this one while we waited
+            if await asyncio.to_thread(self.is_already_processed, job_identifier):
+                logger.info(f"Job already processed, skipping: {job_filename}")
+                return False, None, None
+
+            # Same video submitted again from another job file: reuse the
+            # existing note instead of downloading and analyzing it again
+            existing = await asyncio.to_thread(
+                self.processed_db.find_by_video_id, video_id
+            )
+            if existing and existing["output_path"]:
+                output_path = Path(existing["output_path"])
+                if await asyncio.to_thread(output_path.is_dir):
+                    logger.info(
+                        f"Video already processed as {output_path.name}, "
+                        f"skipping duplicate job: {job_filename}"
+                    )
+                    await asyncio.to_thread(
+                        self.processed_db.mark_processed,
+                        file_path=job_identifier,
+                        status="duplicate",
+                        account_id=account_id,
+                        file_hash=video_id,
+                        output_path=str(output_path),
+                    )
+                    return True, output_path.name, video_id
+
             logger.info(f"Processing video: {video_id} ({url})")
 
-            # Download audio and captions
+            # Download audio and captions. The metadata is fetched first so
+            # the download can skip auto-captions when manual ones exist; the
+            # download reuses it instead of extracting it again.
             download_start = time.time()
-            download_result = self.audio_downloader.download(url, video_id)
+            info = await asyncio.to_thread(self.audio_downloader.get_video_info, url)
+            download_result = await self.audio_downloader.download_async(
+                url, video_id, info
+            )
             download_duration = int((time.time() - download_start) * 1000)
 
             if not download_result:
@@ -123,21 +345,42 @@ class JobProcessor:
                 download_duration_ms=download_duration,
             )
 
+            # Human-made captions are always used as-is; go straight to them
+            # instead of through the Whisper-capable path
+            transcript_result = None
+            caption_path = download_result.caption_path
+            if caption_path and download_result.caption_source == "manual":
+                try:
+                    transcript_result = await asyncio.to_thread(
+                        self.transcriber.parse_captions_only,
+                        caption_path,
+                        download_result.caption_source,
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to parse manual captions: {e}")
+                    caption_path = None
+
             # Transcribe (YouTube captions preferred, Whisper fallback)
-            transcript_result = self.transcriber.transcribe(
-                audio_path=download_result.audio_path,
-                caption_path=download_result.caption_path,
-                caption_source=download_result.caption_source,
-            )
+            if transcript_result is None:
+                transcript_result = await asyncio.to_thread(
+                    self.transcriber.transcribe,
+                    audio_path=download_result.audio_path,
+                    caption_path=caption_path,
+                    caption_source=download_result.caption_source,
+                    duration=download_result.duration,
+                )
 
             # Get available tags
-            available_tags = self.tag_manager.get_available_tags()
+            available_tags = await asyncio.to_thread(
+                self.tag_manager.get_available_tags
+            )
 
             # Analyze with Gemini
             formatted_transcript = transcript_result.format_with_timestamps(
                 interval_seconds=60
             )
-            analysis = self.gemini_client.analyze_video(
+            transcript_length = len(formatted_transcript)
+            analysis = await self.gemini_client.analyze_video_async(
                 transcript=formatted_transcript,
                 video_title=download_result.title,
                 channel=download_result.channel,
@@ -150,11 +393,12 @@ class JobProcessor:
                 video_id=video_id,
                 analysis_result=analysis,
                 available_tags=available_tags,
-                transcript_length=len(formatted_transcript),
+                transcript_length=transcript_length,
             )
 
             # Create Obsidian note
-            folder_path, markdown_path = self.formatter.create_note(
+            folder_path, markdown_path = await asyncio.to_thread(
+                self.formatter.create_note,
                 video_id=video_id,
                 url=url,
                 channel=download_result.channel,
@@ -164,10 +408,15 @@ class JobProcessor:
                 transcript=formatted_transcript,
             )
 
+            # The new note's tags count as learned tags from now on
+            self.tag_manager.invalidate()
+
             # Copy audio file to output folder
             if download_result.audio_path:
                 audio_dest = folder_path / "audio.mp3"
-                shutil.copy2(download_result.audio_path, audio_dest)
+                await asyncio.to_thread(
+                    _fast_copy, Path(download_result.audio_path), audio_dest
+                )
                 logger.info(f"Copied audio to: {audio_dest}")
 
             # Calculate total processing time
@@ -189,7 +438,8 @@ class JobProcessor:
             )
 
             # Mark as processed
-            self.processed_db.mark_processed(
+            await asyncio.to_thread(
+                self.processed_db.mark_processed,
                 file_path=job_identifier,
                 status="success",
                 account_id=account_id,
@@ -198,7 +448,8 @@ class JobProcessor:
             )
 
             # Send success notification
-            self.notification_manager.notify_video_success(
+            await asyncio.to_thread(
+                self.notification_manager.notify_video_success,
                 video_id=video_id,
                 title=analysis.get("title", download_result.title),
                 channel=download_result.channel,
@@ -211,7 +462,7 @@ class JobProcessor:
             )
 
             # Cleanup temp files
-            self.audio_downloader.cleanup(video_id)
+            await asyncio.to_thread(self.audio_downloader.cleanup, video_id)
 
             logger.info(
                 f"Successfully processed video: {download_result.title} "
@@ -236,7 +487,8 @@ class JobProcessor:
                 )
 
             # Mark as error
-            self.processed_db.mark_processed(
+            await asyncio.to_thread(
+                self.processed_db.mark_processed,
                 file_path=job_identifier,
                 status="error",
                 account_id=account_id,
@@ -244,19 +496,37 @@ class JobProcessor:
             )
 
             # Send error notification
-            self.notification_manager.notify_error(
+            await asyncio.to_thread(
+                self.notification_manager.notify_error,
                 video_id=video_id or "unknown",
-                url=url or job_content[:100],
+                url=url or "unparseable",
                 error_message=error_msg,
                 account=account_email or account_id,
             )
 
             # Cleanup on error
             if video_id:
-                self.audio_downloader.cleanup(video_id)
+                await asyncio.to_thread(self.audio_downloader.cleanup, video_id)
 
             return False, None, video_id
 
+        finally:
+            if video_lock is not None:
+                video_lock.release()
+
+    def is_already_processed(self, job_identifier: str) -> bool:
+        """Check if a job was already processed successfully.
+
+        Lets callers skip fetching a job file they won't need.
+
+        Args:
+            job_identifier: Unique identifier for idempotency
+
+        Returns:
+            True if the job completed successfully before
+        """
+        return self.processed_db.is_processed(job_identifier)
+
     @staticmethod
     def is_job_file(file_path: str) -> bool:
         """Check if a file is a valid job file.
@@ -267,5 +537,6 @@ class JobProcessor:
         Returns:
             True if file is a .txt job file
         """
-        return Path(file_path).suffix.lower() == ".txt"
+        # Plain string check; runs for every watcher event and inbox entry
+        return file_path.lower().endswith(".txt")
 
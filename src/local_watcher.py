@@ -1,8 +1,12 @@
 """Local folder watcher for development mode."""
 
 import logging
+import os
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Optional
 
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileCreatedEvent
@@ -11,21 +15,41 @@ from .job_processor import JobProcessor
 
 logger = logging.getLogger(__name__)
 
+# Seconds between size checks while waiting for a new job file to settle
+STABILITY_CHECK_INTERVAL = 0.1
+
+# Size checks before a job file is read regardless
+STABILITY_MAX_CHECKS = 3
+
+# Seconds between stop checks while the startup backlog is processed
+BACKLOG_STOP_CHECK_INTERVAL = 1.0
+
 
 class JobFileHandler(FileSystemEventHandler):
     """Handler for new job files in watch directory."""
 
-    def __init__(self, job_processor: JobProcessor, archive_dir: Path):
+    def __init__(
+        self,
+        job_processor: JobProcessor,
+        archive_dir: Path,
+        executor: ThreadPoolExecutor,
+    ):
         """Initialize file handler.
 
         Args:
             job_processor: Job processor instance
             archive_dir: Directory to move processed files to
+            executor: Bounded pool that runs the jobs
         """
         super().__init__()
         self.job_processor = job_processor
         self.archive_dir = archive_dir
         self.processing = set()  # Track files being processed
+        self._processing_lock = threading.Lock()
+
+        # Jobs run off the watchdog thread, so event dispatch never blocks
+        # and a burst of new files is processed in parallel
+        self._pool = executor
 
     def on_created(self, event):
         """Handle file creation events.
@@ -36,31 +60,52 @@ class JobFileHandler(FileSystemEventHandler):
         if event.is_directory:
             return
 
-        file_path = Path(event.src_path)
-
         # Check if it's a job file (.txt)
-        if not self.job_processor.is_job_file(str(file_path)):
+        if not self.job_processor.is_job_file(event.src_path):
             return
 
+        file_path = Path(event.src_path)
+
         # Avoid duplicate processing
-        if str(file_path) in self.processing:
-            return
+        with self._processing_lock:
+            if str(file_path) in self.processing:
+                return
+            self.processing.add(str(file_path))
+
+        self._pool.submit(self._handle, file_path)
+
+    @staticmethod
+    def _wait_until_stable(file_path: Path):
+        """Wait until a file's size stops changing (it is fully written).
+
+        Args:
+            file_path: File to watch
+        """
+        size = file_path.stat().st_size
+        for _ in range(STABILITY_MAX_CHECKS):
+            time.sleep(STABILITY_CHECK_INTERVAL)
+            new_size = file_path.stat().st_size
+            if new_size == size:
+                return
+            size = new_size
 
-        self.processing.add(str(file_path))
+    def _handle(self, file_path: Path):
+        """Process one new job file (runs on the job pool).
 
+        Args:
+            file_path: Path to the job file
+        """
         try:
-            # Wait a bit to ensure file is fully written
-            time.sleep(0.5)
+            self._wait_until_stable(file_path)
 
-            # Read job content
-            with open(file_path, "r", encoding="utf-8") as f:
-                job_content = f.read()
+            # Job files are a single URL; read in one call
+            job_content = file_path.read_text(encoding="utf-8", errors="replace")
 
             # Process the job
             logger.info(f"New job file detected: {file_path.name}")
 
             success, output_folder, video_id = self.job_processor.process_job_file(
-                job_content=job_content,
+                url=self.job_processor.parse_job_content(job_content),
                 job_filename=file_path.name,
                 job_identifier=f"local:{file_path.absolute()}",
                 account_id="local",
@@ -77,7 +122,8 @@ class JobFileHandler(FileSystemEventHandler):
             logger.error(f"Error handling new file {file_path}: {e}")
 
         finally:
-            self.processing.discard(str(file_path))
+            with self._processing_lock:
+                self.processing.discard(str(file_path))
 
 
 class LocalFolderWatcher:
@@ -88,6 +134,8 @@ class LocalFolderWatcher:
         inbox_dir: str,
         archive_dir: str,
         job_processor: JobProcessor,
+        executor: Optional[ThreadPoolExecutor] = None,
+        stop_event: Optional[threading.Event] = None,
     ):
         """Initialize local folder watcher.
 
@@ -95,11 +143,28 @@ class LocalFolderWatcher:
             inbox_dir: Inbox directory to watch for new files
             archive_dir: Archive directory for processed files
             job_processor: Job processor instance
+            executor: Pool to run jobs on; the caller owns and shuts it
+                down. If None, the watcher creates one with
+                max_concurrent_jobs workers.
+            stop_event: Event that ends run() when set (e.g. by a signal
+                handler); a private one is created if None
         """
         self.inbox_dir = Path(inbox_dir)
         self.archive_dir = Path(archive_dir)
         self.job_processor = job_processor
+
+        # The startup backlog and new files share one bounded pool, so at
+        # most max_concurrent_jobs jobs run however many files arrive
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=job_processor.config.max_concurrent_jobs,
+            thread_name_prefix="local-job",
+        )
         self.observer = None
+        self.event_handler = None
+
+        # Set by stop(); run() sleeps on it instead of waking up every second
+        self._stop_event = stop_event or threading.Event()
 
         # Ensure directories exist
         self.inbox_dir.mkdir(parents=True, exist_ok=True)
@@ -108,48 +173,90 @@ class LocalFolderWatcher:
         logger.info(f"Initialized local folder watcher for: {self.inbox_dir}")
 
     def process_existing_files(self):
-        """Process any existing job files in the inbox directory."""
+        """Process any existing job files in the inbox directory.
+
+        Jobs run in parallel (up to max_concurrent_jobs), so a backlog that
+        built up while the service was down clears quickly on startup. On
+        stop, jobs that haven't started yet are cancelled; their files stay
+        in the inbox for the next start.
+        """
         logger.info("Checking for existing job files in inbox directory...")
 
         processed_count = 0
-        for file_path in self.inbox_dir.iterdir():
-            if file_path.is_file() and self.job_processor.is_job_file(str(file_path)):
-                try:
-                    # Read job content
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        job_content = f.read()
-
-                    success, _, _ = self.job_processor.process_job_file(
-                        job_content=job_content,
-                        job_filename=file_path.name,
-                        job_identifier=f"local:{file_path.absolute()}",
-                        account_id="local",
-                        account_email="local",
-                    )
-
-                    if success:
-                        # Move to archive
-                        archive_path = self.archive_dir / file_path.name
-                        file_path.rename(archive_path)
-                        processed_count += 1
-
-                except Exception as e:
-                    logger.error(f"Error processing existing file {file_path.name}: {e}")
+        submit = self.executor.submit
+
+        # scandir yields names and cached file types, no Path per entry
+        with os.scandir(self.inbox_dir) as entries:
+            futures = [
+                submit(self._process_existing_file, Path(entry.path))
+                for entry in entries
+                if entry.is_file() and self.job_processor.is_job_file(entry.name)
+            ]
+        pending = set(futures)
+        while pending:
+            if self._stop_event.is_set():
+                for future in pending:
+                    future.cancel()
+                logger.info("Stopped processing existing job files")
+                return
+            done, pending = wait(
+                pending,
+                timeout=BACKLOG_STOP_CHECK_INTERVAL,
+                return_when=FIRST_COMPLETED,
+            )
+            processed_count += sum(1 for future in done if future.result())
 
         if processed_count > 0:
             logger.info(f"Processed {processed_count} existing job file(s)")
         else:
             logger.info("No existing job files to process")
 
+    def _process_existing_file(self, file_path: Path) -> bool:
+        """Process one job file found in the inbox at startup.
+
+        Args:
+            file_path: Path to the job file
+
+        Returns:
+            True if the job succeeded and was archived
+        """
+        try:
+            job_content = file_path.read_text(encoding="utf-8", errors="replace")
+
+            success, _, _ = self.job_processor.process_job_file(
+                url=self.job_processor.parse_job_content(job_content),
+                job_filename=file_path.name,
+                job_identifier=f"local:{file_path.absolute()}",
+                account_id="local",
+                account_email="local",
+            )
+
+            if success:
+                # Move to archive
+                archive_path = self.archive_dir / file_path.name
+                file_path.rename(archive_path)
+                return True
+
+        except Exception as e:
+            logger.error(f"Error processing existing file {file_path.name}: {e}")
+
+        return False
+
     def start(self):
         """Start watching the inbox folder."""
         # Process existing files first
         self.process_existing_files()
+        if self._stop_event.is_set():
+            return
 
         # Set up file system observer
-        event_handler = JobFileHandler(self.job_processor, self.archive_dir)
+        self.event_handler = JobFileHandler(
+            self.job_processor, self.archive_dir, self.executor
+        )
         self.observer = Observer()
-        self.observer.schedule(event_handler, str(self.inbox_dir), recursive=False)
+        self.observer.schedule(
+            self.event_handler, str(self.inbox_dir), recursive=False
+        )
         self.observer.start()
 
         logger.info(f"Started watching inbox: {self.inbox_dir}")
@@ -157,18 +264,25 @@ class LocalFolderWatcher:
 
     def stop(self):
         """Stop watching the folder."""
+        self._stop_event.set()
         if self.observer:
             self.observer.stop()
             self.observer.join()
+            self.observer = None
             logger.info("Stopped local folder watcher")
+        # Also reached when stopped during the startup backlog, before the
+        # observer was scheduled
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
 
     def run(self):
         """Run the watcher (blocking)."""
         self.start()
 
         try:
-            while True:
-                time.sleep(1)
+            # Blocks until stop() is called (e.g. from a signal handler);
+            # the observer thread does the actual work
+            self._stop_event.wait()
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
         finally:
@@ -2,13 +2,27 @@
 
 import logging
 import json
+import os
+import queue
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string with a Z suffix.
+
+    Formats time.time_ns() directly instead of building a datetime; same
+    output as datetime.utcnow().isoformat() + "Z" with microseconds.
+    """
+    secs, nanos = divmod(time.time_ns(), 1_000_000_000)
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs))
+    return f"{stamp}.{nanos // 1000:06d}Z"
+
+
 class LogWriter:
     """Writes comprehensive logs for video processing."""
 
@@ -26,19 +40,61 @@ class LogWriter:
         if self.enabled:
             self.logs_dir.mkdir(parents=True, exist_ok=True)
 
-    def _get_log_filename(self, video_id: str, suffix: str = "") -> str:
-        """Generate log filename from video ID.
+        # Events are serialized by the caller and appended to the day's
+        # shard by a background thread, so pipeline stages don't wait on
+        # file I/O
+        self._queue: "queue.Queue[Tuple[str, bytes]]" = queue.Queue()
+        if self.enabled:
+            threading.Thread(target=self._drain, name="log-writer", daemon=True).start()
 
-        Args:
-            video_id: YouTube video ID
-            suffix: Optional suffix to add
+    def _drain(self):
+        """Append queued events to disk (runs on the log writer thread).
 
-        Returns:
-            Log filename (without extension)
+        Keeps the current day's shard open and flushes it whenever the
+        queue runs dry, so a burst of events costs one write call each and
+        a single flush.
+        """
+        day = None
+        handle = None
+        while True:
+            event_day, line = self._queue.get()
+            try:
+                if event_day != day:
+                    if handle:
+                        handle.close()
+                    handle = open(self.logs_dir / f"events-{event_day}.jsonl", "ab")
+                    day = event_day
+                handle.write(line)
+                if self._queue.empty():
+                    handle.flush()
+            except Exception as e:
+                logger.error(f"Error writing log event: {e}")
+                day = None
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued event has been written."""
+        if self.enabled:
+            self._queue.join()
+
+    def _append_event(self, event_type: str, data: Dict[str, Any]):
+        """Queue one event for the daily events-YYYYMMDD.jsonl shard.
+
+        One append-only file per day instead of one file per video and
+        stage keeps the Logs folder small, which matters when it is synced.
+        Serializes now, so later changes to data don't leak into the log.
+
+        Args:
+            event_type: Event kind ("download", "analysis", "processing",
+                "error")
+            data: Event fields; must include video_id
         """
-        if suffix:
-            return f"{video_id}_{suffix}"
-        return video_id
+        line = json.dumps(
+            {"type": event_type, **data}, ensure_ascii=False, separators=(",", ":")
+        )
+        day = time.strftime("%Y%m%d", time.gmtime())
+        self._queue.put((day, line.encode("utf-8") + b"\n"))
 
     def write_download_log(
         self,
@@ -62,15 +118,12 @@ class LogWriter:
             download_duration_ms: Download time in milliseconds
 
         Returns:
-            True if written successfully
+            True if the event was queued for writing
         """
         if not self.enabled:
             return False
 
         try:
-            log_filename = f"{video_id}_download.json"
-            log_path = self.logs_dir / log_filename
-
             log_data = {
                 "video_id": video_id,
                 "url": url,
@@ -79,13 +132,11 @@ class LogWriter:
                 "duration_seconds": duration,
                 "caption_source": caption_source,
                 "download_duration_ms": download_duration_ms,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": _now_iso(),
             }
 
-            with open(log_path, "w", encoding="utf-8") as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            self._append_event("download", log_data)
 
-            logger.debug(f"Wrote download log: {log_filename}")
             return True
 
         except Exception as e:
@@ -108,27 +159,22 @@ class LogWriter:
             transcript_length: Length of transcript in characters
 
         Returns:
-            True if written successfully
+            True if the event was queued for writing
         """
         if not self.enabled:
             return False
 
         try:
-            log_filename = f"{video_id}_analysis.json"
-            log_path = self.logs_dir / log_filename
-
             log_data = {
                 "video_id": video_id,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": _now_iso(),
                 "transcript_length": transcript_length,
                 "available_tags": available_tags,
                 "analysis_result": analysis_result,
             }
 
-            with open(log_path, "w", encoding="utf-8") as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            self._append_event("analysis", log_data)
 
-            logger.debug(f"Wrote analysis log: {log_filename}")
             return True
 
         except Exception as e:
@@ -159,20 +205,17 @@ class LogWriter:
             error_message: Optional error message if status is error
 
         Returns:
-            True if written successfully
+            True if the event was queued for writing
         """
         if not self.enabled:
             return False
 
         try:
-            log_filename = f"{video_id}_processing.json"
-            log_path = self.logs_dir / log_filename
-
             log_data = {
                 "video_id": video_id,
                 "input_file": input_filename,
                 "output_folder": output_folder,
-                "processed_at": datetime.utcnow().isoformat() + "Z",
+                "processed_at": _now_iso(),
                 "processing_duration_ms": processing_duration_ms,
                 "status": status,
                 "transcription_source": transcription_source,
@@ -182,10 +225,8 @@ class LogWriter:
             if error_message:
                 log_data["error_message"] = error_message
 
-            with open(log_path, "w", encoding="utf-8") as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            self._append_event("processing", log_data)
 
-            logger.debug(f"Wrote processing log: {log_filename}")
             return True
 
         except Exception as e:
@@ -210,18 +251,15 @@ class LogWriter:
             context: Optional additional context
 
         Returns:
-            True if written successfully
+            True if the event was queued for writing
         """
         if not self.enabled:
             return False
 
         try:
-            log_filename = f"{video_id}_error.json"
-            log_path = self.logs_dir / log_filename
-
             log_data = {
                 "video_id": video_id,
-                "error_at": datetime.utcnow().isoformat() + "Z",
+                "error_at": _now_iso(),
                 "error_type": error_type,
                 "error_message": error_message,
             }
@@ -232,10 +270,8 @@ class LogWriter:
             if context:
                 log_data["context"] = context
 
-            with open(log_path, "w", encoding="utf-8") as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            self._append_event("error", log_data)
 
-            logger.debug(f"Wrote error log: {log_filename}")
             return True
 
         except Exception as e:
@@ -254,20 +290,32 @@ class LogWriter:
         if not self.enabled:
             return 0
 
-        import time
-
         cutoff_time = time.time() - (days_to_keep * 24 * 60 * 60)
         deleted_count = 0
 
+        failed = []
+
         try:
-            for log_file in self.logs_dir.glob("*.json"):
-                if log_file.stat().st_mtime < cutoff_time:
-                    log_file.unlink()
-                    deleted_count += 1
+            # scandir hands back names and cached stat results in one pass
+            with os.scandir(self.logs_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith((".jsonl", ".json")):
+                        continue
+                    try:
+                        if entry.stat().st_mtime < cutoff_time:
+                            os.unlink(entry.path)
+                            deleted_count += 1
+                    except OSError:
+                        failed.append(entry.name)
 
             if deleted_count > 0:
                 logger.info(f"Cleaned up {deleted_count} old log files")
 
+            if failed:
+                logger.warning(
+                    f"Could not clean up {len(failed)} log files, e.g. {failed[0]}"
+                )
+
             return deleted_count
 
         except Exception as e:
@@ -1,9 +1,11 @@
 """Main entry point for VoxBox service."""
 
 import logging
+import os
 import signal
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from .config import Config
@@ -11,9 +13,6 @@ from .storage import TokenStorage, ProcessedFilesDB
 from .gemini_client import GeminiClient
 from .notifications import NotificationManager, TelegramNotification, EmailNotification
 from .job_processor import JobProcessor
-from .local_watcher import LocalFolderWatcher
-from .dropbox_oauth import OAuthManager
-from .dropbox_watcher import DropboxWatcher
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +28,12 @@ class VoxBoxService:
         """
         self.config = config
         self.watcher = None
+        self.job_processor = None
+        self._job_executor: Optional[ThreadPoolExecutor] = None
+
+        # Set by the signal handler; the running watcher waits on it, so
+        # the main thread wakes up and shuts down outside the signal frame
+        self._shutdown_event = threading.Event()
 
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -42,16 +47,28 @@ class VoxBoxService:
         logger.info(f"Whisper Model: {config.whisper_model} (fallback)")
 
     def _signal_handler(self, signum, frame):
-        """Handle shutdown signals gracefully."""
+        """Handle shutdown signals gracefully.
+
+        Only flags the shutdown: the watcher's wait on the main thread
+        returns and run() calls shutdown() from ordinary code.
+        """
         logger.info(f"Received signal {signum}, shutting down...")
-        self.shutdown()
-        sys.exit(0)
+        if self.watcher is None:
+            # Still starting up (e.g. waiting for OAuth); nothing waits on
+            # the event yet, so unwind the main thread directly
+            raise KeyboardInterrupt
+        self._shutdown_event.set()
 
     def shutdown(self):
         """Gracefully shutdown the service."""
         if self.watcher:
-            if isinstance(self.watcher, LocalFolderWatcher):
-                self.watcher.stop()
+            self.watcher.stop()
+        if self._job_executor:
+            # Let running jobs finish before the job processor goes away
+            self._job_executor.shutdown(wait=True, cancel_futures=True)
+            self._job_executor = None
+        if self.job_processor:
+            self.job_processor.close()
         logger.info("Service stopped")
 
     def initialize_components(self) -> tuple:
@@ -67,6 +84,7 @@ class VoxBoxService:
             model_name=self.config.gemini_model,
             max_retries=self.config.max_retries,
             retry_delay=self.config.retry_delay,
+            cache_dir=os.path.join(self.config.data_dir, "gemini_cache"),
         )
 
         # Initialize processed files database
@@ -101,6 +119,7 @@ class VoxBoxService:
             notification_manager=notification_manager,
             config=self.config,
         )
+        self.job_processor = job_processor
 
         return gemini_client, processed_db, notification_manager, job_processor
 
@@ -115,14 +134,27 @@ class VoxBoxService:
         logger.info(f"Logs directory: {self.config.logs_dir}")
         logger.info("")
 
+        # Imported per mode, so local mode never loads the Dropbox SDK and
+        # Dropbox mode never loads watchdog
+        from .local_watcher import LocalFolderWatcher
+
         # Initialize components
         _, _, _, job_processor = self.initialize_components()
 
+        # Jobs run on a pool bounded by MAX_CONCURRENT_JOBS, however many
+        # files are dropped into the inbox at once
+        self._job_executor = ThreadPoolExecutor(
+            max_workers=self.config.max_concurrent_jobs,
+            thread_name_prefix="local-job",
+        )
+
         # Create and run local watcher
         self.watcher = LocalFolderWatcher(
             inbox_dir=self.config.inbox_dir,
             archive_dir=self.config.archive_dir,
             job_processor=job_processor,
+            executor=self._job_executor,
+            stop_event=self._shutdown_event,
         )
 
         logger.info("Ready to process videos! Add .txt files with YouTube URLs to Inbox.")
@@ -133,14 +165,15 @@ class VoxBoxService:
 
     def run_oauth_server_thread(self, oauth_manager):
         """Run OAuth server in a separate thread."""
-        from http.server import HTTPServer
+        from http.server import ThreadingHTTPServer
         from .dropbox_oauth import OAuthCallbackHandler
 
         # Set up callback handler
         OAuthCallbackHandler.oauth_manager = oauth_manager
 
-        # Create server
-        server = HTTPServer(
+        # Create server (threaded, so one browser's idle keep-alive
+        # connection never blocks another user's request)
+        server = ThreadingHTTPServer(
             (self.config.oauth_server_host, self.config.oauth_server_port),
             OAuthCallbackHandler,
         )
@@ -173,6 +206,9 @@ class VoxBoxService:
             )
             sys.exit(1)
 
+        from .dropbox_oauth import OAuthManager
+        from .dropbox_watcher import DropboxWatcher
+
         # Initialize components
         _, _, _, job_processor = self.initialize_components()
 
@@ -248,6 +284,8 @@ class VoxBoxService:
             job_processor=job_processor,
             oauth_manager=oauth_manager,
             poll_interval=self.config.poll_interval,
+            max_workers=self.config.max_concurrent_jobs,
+            stop_event=self._shutdown_event,
         )
 
         logger.info("Ready to process videos from Dropbox!")
@@ -267,6 +305,9 @@ class VoxBoxService:
                 logger.error(f"Invalid mode: {self.config.mode}")
                 sys.exit(1)
 
+            # The watcher returned because a shutdown was requested
+            self.shutdown()
+
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
             self.shutdown()
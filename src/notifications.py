@@ -1,16 +1,40 @@
 """Notification system for video processing results."""
 
+import html
 import logging
 import requests
 import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional, Dict, Any, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from abc import ABC, abstractmethod
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Retries for a Telegram send that hits a connection error or a 429/5xx
+TELEGRAM_RETRIES = 3
+
+# Last formatted local time as (epoch second, string); notifications only
+# show seconds, so the string is reused until the second rolls over
+_ts_cache = (0, "")
+
+
+def _now_str() -> str:
+    """Current local time as "YYYY-MM-DD HH:MM:SS"."""
+    global _ts_cache
+    now = int(time.time())
+    cached = _ts_cache
+    if cached[0] != now:
+        cached = (now, datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S"))
+        _ts_cache = cached
+    return cached[1]
+
 
 class NotificationProvider(ABC):
     """Abstract base class for notification providers."""
@@ -28,6 +52,9 @@ class NotificationProvider(ABC):
         """
         pass
 
+    def close(self):
+        """Release connections held by the provider (no-op by default)."""
+
 
 class TelegramNotification(NotificationProvider):
     """Telegram notification provider."""
@@ -43,6 +70,23 @@ class TelegramNotification(NotificationProvider):
         self.chat_id = chat_id
         self.api_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
 
+        # Keep-alive session, so each notification reuses the pooled HTTPS
+        # connection instead of paying a new TLS handshake. Transient
+        # failures are retried on the same session with backoff; urllib3
+        # honours Telegram's Retry-After header on 429.
+        retry = Retry(
+            total=TELEGRAM_RETRIES,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=["POST"],
+            respect_retry_after_header=True,
+        )
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry),
+        )
+
     def send(self, message: str, parse_mode: str = "HTML", **kwargs) -> bool:
         """Send a message via Telegram.
 
@@ -61,7 +105,7 @@ class TelegramNotification(NotificationProvider):
                 "parse_mode": parse_mode,
             }
 
-            response = requests.post(self.api_url, json=payload, timeout=10)
+            response = self.session.post(self.api_url, json=payload, timeout=10)
             response.raise_for_status()
 
             logger.debug("Telegram notification sent successfully")
@@ -71,6 +115,10 @@ class TelegramNotification(NotificationProvider):
             logger.error(f"Failed to send Telegram notification: {e}")
             return False
 
+    def close(self):
+        """Close the HTTP session."""
+        self.session.close()
+
 
 class EmailNotification(NotificationProvider):
     """Email notification provider."""
@@ -88,6 +136,48 @@ class EmailNotification(NotificationProvider):
         self.from_address = smtp_config["from_address"]
         self.to_address = smtp_config["to_address"]
 
+        # One logged-in connection is reused across messages, so a send is a
+        # single DATA exchange instead of connect + STARTTLS + AUTH
+        self._conn: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+
+    def _get_conn(self) -> smtplib.SMTP:
+        """Return a live SMTP connection, reconnecting if it went stale.
+
+        Must be called with the lock held.
+
+        Returns:
+            Logged-in SMTP connection
+        """
+        if self._conn is not None:
+            try:
+                self._conn.noop()
+                return self._conn
+            except OSError:  # SMTPException is an OSError too
+                self._drop_conn()
+
+        conn = smtplib.SMTP(self.smtp_host, self.smtp_port)
+        try:
+            conn.ehlo()
+            conn.starttls()
+            conn.ehlo()
+            conn.login(self.username, self.password)
+        except Exception:
+            conn.close()
+            raise
+
+        self._conn = conn
+        return conn
+
+    def _drop_conn(self):
+        """Close and forget the cached connection (lock held)."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
     def send(
         self, message: str, subject: str = "VoxBox Notification", **kwargs
     ) -> bool:
@@ -109,10 +199,14 @@ class EmailNotification(NotificationProvider):
 
             msg.attach(MIMEText(message, "plain"))
 
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            with self._lock:
+                try:
+                    self._get_conn().send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    # Server closed the idle connection between NOOP and
+                    # DATA; reconnect once
+                    self._drop_conn()
+                    self._get_conn().send_message(msg)
 
             logger.debug("Email notification sent successfully")
             return True
@@ -121,6 +215,16 @@ class EmailNotification(NotificationProvider):
             logger.error(f"Failed to send email notification: {e}")
             return False
 
+    def close(self):
+        """Log out of the SMTP server."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.quit()
+                except Exception:
+                    pass
+                self._conn = None
+
 
 class NotificationManager:
     """Manages multiple notification providers."""
@@ -129,6 +233,11 @@ class NotificationManager:
         """Initialize notification manager."""
         self.providers: List[NotificationProvider] = []
 
+        # Providers are independent network calls, so they're sent in
+        # parallel; the pool is created on first use
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
     def add_provider(self, provider: NotificationProvider):
         """Add a notification provider.
 
@@ -138,6 +247,38 @@ class NotificationManager:
         self.providers.append(provider)
         logger.info(f"Added notification provider: {provider.__class__.__name__}")
 
+    def close(self):
+        """Stop the send pool and close all providers' connections."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+        for provider in self.providers:
+            provider.close()
+
+    def _broadcast(self, message: str) -> None:
+        """Send a message through every provider concurrently.
+
+        Args:
+            message: Message text
+        """
+        if len(self.providers) < 2:
+            for provider in self.providers:
+                provider.send(message)
+            return
+
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=len(self.providers),
+                    thread_name_prefix="notify",
+                )
+            pool = self._pool
+
+        # Providers log and swallow their own errors; wait for all of them
+        list(pool.map(lambda provider: provider.send(message), self.providers))
+
     def notify_video_success(
         self,
         video_id: str,
@@ -163,19 +304,27 @@ class NotificationManager:
             summary_excerpt: Short excerpt from summary
             account: Account identifier
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = _now_str()
 
         # Format duration
         duration_str = f"{duration // 60}m {duration % 60}s"
 
-        # Format tags
+        # Titles, summaries and errors are untrusted text in an HTML message;
+        # an unescaped "<" or "&" makes Telegram reject the whole message
+        escape = html.escape
+        title = escape(title)
+        channel = escape(channel)
+        summary_excerpt = escape(summary_excerpt[:300])
+
+        # Format tags (lookups bound to locals once, outside the loop)
         tags_list = []
+        get = dict.get
+        append = tags_list.append
         for tag in tags:
-            name = tag.get("name", "unknown")
-            confidence = tag.get("confidence", 0)
-            is_primary = tag.get("primary", False)
-            emoji = "⭐" if is_primary else ""
-            tags_list.append(f"  • {name} ({confidence}%) {emoji}")
+            name = escape(get(tag, "name", "unknown"))
+            confidence = get(tag, "confidence", 0)
+            emoji = "⭐" if get(tag, "primary", False) else ""
+            append(f"  • {name} ({confidence}%) {emoji}")
 
         # Build message
         message_parts = [
@@ -188,7 +337,7 @@ class NotificationManager:
         ]
 
         if account:
-            message_parts.append(f"<b>Account:</b> {account}")
+            message_parts.append(f"<b>Account:</b> {escape(account)}")
 
         message_parts.extend(
             [
@@ -200,14 +349,13 @@ class NotificationManager:
                 *tags_list,
                 "",
                 "<b>Summary Preview:</b>",
-                f"<code>{summary_excerpt[:300]}...</code>",
+                f"<code>{summary_excerpt}...</code>",
             ]
         )
 
         message = "\n".join(message_parts)
 
-        for provider in self.providers:
-            provider.send(message)
+        self._broadcast(message)
 
     def notify_error(
         self,
@@ -224,31 +372,30 @@ class NotificationManager:
             error_message: Error message
             account: Account identifier
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = _now_str()
 
         message_parts = [
             "❌ <b>Video Processing Failed</b>",
             "",
             f"<b>Video ID:</b> {video_id}",
-            f"<b>URL:</b> {url}",
+            f"<b>URL:</b> {html.escape(url)}",
             f"<b>Time:</b> {timestamp}",
         ]
 
         if account:
-            message_parts.append(f"<b>Account:</b> {account}")
+            message_parts.append(f"<b>Account:</b> {html.escape(account)}")
 
         message_parts.extend(
             [
                 "",
                 "<b>Error:</b>",
-                f"<code>{error_message}</code>",
+                f"<code>{html.escape(error_message)}</code>",
             ]
         )
 
         message = "\n".join(message_parts)
 
-        for provider in self.providers:
-            provider.send(message)
+        self._broadcast(message)
 
     def notify_processing_started(
         self,
@@ -263,13 +410,12 @@ class NotificationManager:
             title: Video title
             account: Account identifier
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = _now_str()
 
-        message = f"🎬 <b>Processing Started</b>\n\n<b>Title:</b> {title}\n<b>ID:</b> {video_id}\n<b>Time:</b> {timestamp}"
+        message = f"🎬 <b>Processing Started</b>\n\n<b>Title:</b> {html.escape(title)}\n<b>ID:</b> {video_id}\n<b>Time:</b> {timestamp}"
 
         if account:
-            message += f"\n<b>Account:</b> {account}"
+            message += f"\n<b>Account:</b> {html.escape(account)}"
 
-        for provider in self.providers:
-            provider.send(message)
+        self._broadcast(message)
 
@@ -1,13 +1,110 @@
 """Obsidian markdown formatter for video notes."""
 
 import logging
+import os
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Any, Dict, List, Optional, TextIO
 
 logger = logging.getLogger(__name__)
 
+# Characters not allowed in file names on common filesystems
+UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Runs of whitespace and underscores, collapsed to a single underscore
+FILENAME_SEPARATOR_RE = re.compile(r"[\s_]+")
+
+# Write buffer for notes, large enough that most notes take one write call
+MARKDOWN_BUFFER_SIZE = 1 << 20
+
+
+def _sanitize_filename(name: str, max_length: int = 50) -> str:
+    """Sanitize a string for use as filename.
+
+    Args:
+        name: Original name
+        max_length: Maximum filename length
+
+    Returns:
+        Sanitized filename
+    """
+    # Remove or replace problematic characters
+    sanitized = UNSAFE_FILENAME_RE.sub("", name)
+
+    # Replace spaces and repeated underscores in one pass
+    sanitized = FILENAME_SEPARATOR_RE.sub("_", sanitized)
+
+    # Remove leading/trailing underscores
+    sanitized = sanitized.strip("_")
+
+    # Truncate if needed
+    if len(sanitized) > max_length:
+        sanitized = sanitized[:max_length].rstrip("_")
+
+    # Ensure we have something
+    if not sanitized:
+        sanitized = "Untitled"
+
+    return sanitized
+
+
+def _escape_yaml(text: str) -> str:
+    """Escape text for YAML string value."""
+    # Escape quotes
+    return text.replace('"', '\\"')
+
+
+def _format_duration(seconds: int) -> str:
+    """Format duration as human-readable string."""
+    if seconds <= 0:
+        return "Unknown"
+
+    hours = seconds // 3600
+    minutes = (seconds % 3600) // 60
+    secs = seconds % 60
+
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    else:
+        return f"{minutes}:{secs:02d}"
+
+
+def _frontmatter(
+    title: str,
+    channel: str,
+    url: str,
+    upload_date: str,
+    tags: List[str],
+    processed_date: str,
+    duration: int,
+) -> str:
+    """Build YAML frontmatter (see ObsidianFormatter._build_frontmatter)."""
+    # Format duration
+    duration_str = _format_duration(duration)
+
+    # One list of pieces and a single join; each tag adds its own line
+    parts = [
+        '---\ntitle: "',
+        _escape_yaml(title),
+        '"\nchannel: "',
+        _escape_yaml(channel),
+        '"\nurl: "',
+        url,
+        '"\nupload_date: ',
+        upload_date,
+        '\nduration: "',
+        duration_str,
+        '"\ntags:\n',
+    ]
+    for tag in tags:
+        parts += ("  - ", tag, "\n")
+    if not tags:
+        parts.append("\n")
+    parts += ("processed_date: ", processed_date, "\n---")
+
+    return "".join(parts)
+
 
 class ObsidianFormatter:
     """Formats video analysis results into Obsidian-compatible markdown."""
@@ -49,42 +146,47 @@ class ObsidianFormatter:
         """
         # Get clean title from analysis
         title = analysis.get("title", "Untitled")
-        safe_title = self._sanitize_filename(title)
+        safe_title = _sanitize_filename(title)
 
-        # Create folder name: YYYY-MM-DD_Safe_Title
+        # Create folder name: YYYY-MM-DD_Safe_Title. The same date goes into
+        # the frontmatter, so both agree even when a job crosses midnight.
         today = datetime.now().strftime("%Y-%m-%d")
         folder_name = f"{today}_{safe_title}"
         folder_path = self.outbox_dir / folder_name
 
         # Handle duplicate folders
-        folder_path = self._ensure_unique_path(folder_path)
-        folder_path.mkdir(parents=True, exist_ok=True)
-
-        # Generate markdown content
-        markdown_content = self._generate_markdown(
-            title=title,
-            url=url,
-            channel=channel,
-            duration=duration,
-            upload_date=upload_date,
-            analysis=analysis,
-            transcript=transcript,
-            audio_filename=audio_filename,
-        )
+        folder_path = self._create_unique_folder(folder_path)
 
-        # Write markdown file
         markdown_filename = f"{safe_title}.md"
         markdown_path = folder_path / markdown_filename
 
-        with open(markdown_path, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
+        # Write the note section by section into a temp file, then rename
+        # it into place: the transcript is never copied into one big string
+        # and Obsidian (or Dropbox) never sees a half-written note
+        tmp_path = markdown_path.with_suffix(".md.tmp")
+        buffering = MARKDOWN_BUFFER_SIZE
+        with open(tmp_path, "w", encoding="utf-8", buffering=buffering) as f:
+            self._write_markdown(
+                f,
+                title=title,
+                url=url,
+                channel=channel,
+                duration=duration,
+                upload_date=upload_date,
+                analysis=analysis,
+                transcript=transcript,
+                audio_filename=audio_filename,
+                processed_date=today,
+            )
+        os.replace(tmp_path, markdown_path)
 
         logger.info(f"Created note: {markdown_path}")
 
         return folder_path, markdown_path
 
-    def _generate_markdown(
+    def _write_markdown(
         self,
+        f: TextIO,
         title: str,
         url: str,
         channel: str,
@@ -93,10 +195,12 @@ class ObsidianFormatter:
         analysis: Dict[str, Any],
         transcript: str,
         audio_filename: str,
-    ) -> str:
-        """Generate markdown content for the note.
+        processed_date: str,
+    ) -> None:
+        """Write the markdown content of the note.
 
         Args:
+            f: Open text file to write to
             title: Video title
             url: Video URL
             channel: Channel name
@@ -105,12 +209,9 @@ class ObsidianFormatter:
             analysis: Analysis results
             transcript: Formatted transcript
             audio_filename: Audio file name
-
-        Returns:
-            Complete markdown content
+            processed_date: Processing date (YYYY-MM-DD)
         """
         # Format dates
-        processed_date = datetime.now().strftime("%Y-%m-%d")
         if upload_date and len(upload_date) == 8:
             formatted_upload_date = f"{upload_date[:4]}-{upload_date[4:6]}-{upload_date[6:]}"
         else:
@@ -142,8 +243,9 @@ class ObsidianFormatter:
         topics = analysis.get("topics", [])
         topics_md = self._format_topics(topics)
 
-        # Assemble the full document
-        content = f"""{frontmatter}
+        # Everything above the transcript is small; the transcript is
+        # written as its own piece
+        f.write(f"""{frontmatter}
 
 # {title}
 
@@ -165,10 +267,9 @@ class ObsidianFormatter:
 
 ## Full Transcript
 
-{transcript}
-"""
-
-        return content
+""")
+        f.write(transcript)
+        f.write("\n")
 
     def _build_frontmatter(
         self,
@@ -194,31 +295,24 @@ class ObsidianFormatter:
         Returns:
             YAML frontmatter string
         """
-        # Format duration
-        duration_str = self._format_duration(duration)
-
-        # Build tags list
-        tags_yaml = "\n".join(f"  - {tag}" for tag in tags)
-
-        frontmatter = f"""---
-title: "{self._escape_yaml(title)}"
-channel: "{self._escape_yaml(channel)}"
-url: "{url}"
-upload_date: {upload_date}
-duration: "{duration_str}"
-tags:
-{tags_yaml}
-processed_date: {processed_date}
----"""
-
-        return frontmatter
+        return _frontmatter(
+            title,
+            channel,
+            url,
+            upload_date,
+            tags,
+            processed_date,
+            duration,
+        )
 
     def _format_takeaways(self, takeaways: List[str]) -> str:
         """Format key takeaways as bullet points."""
         if not takeaways:
             return "* No key takeaways extracted."
 
-        return "\n".join(f"* {takeaway}" for takeaway in takeaways)
+        # A list comprehension hands join its list directly; a generator is
+        # materialized into one first
+        return "\n".join([f"* {takeaway}" for takeaway in takeaways])
 
     def _format_topics(self, topics: List[str]) -> str:
         """Format topics section if present."""
@@ -228,81 +322,47 @@ processed_date: {processed_date}
         topics_list = ", ".join(topics)
         return f"\n### Topics Covered\n\n{topics_list}\n"
 
-    @staticmethod
-    def _sanitize_filename(name: str, max_length: int = 50) -> str:
-        """Sanitize a string for use as filename.
-
-        Args:
-            name: Original name
-            max_length: Maximum filename length
-
-        Returns:
-            Sanitized filename
-        """
-        # Remove or replace problematic characters
-        sanitized = re.sub(r'[<>:"/\\|?*]', "", name)
+    def _create_unique_folder(self, path: Path) -> Path:
+        """Create a new folder at path, adding a counter if it is taken.
 
-        # Replace spaces and multiple hyphens
-        sanitized = re.sub(r"\s+", "_", sanitized)
-        sanitized = re.sub(r"_+", "_", sanitized)
-
-        # Remove leading/trailing underscores
-        sanitized = sanitized.strip("_")
-
-        # Truncate if needed
-        if len(sanitized) > max_length:
-            sanitized = sanitized[:max_length].rstrip("_")
-
-        # Ensure we have something
-        if not sanitized:
-            sanitized = "Untitled"
-
-        return sanitized
-
-    @staticmethod
-    def _escape_yaml(text: str) -> str:
-        """Escape text for YAML string value."""
-        # Escape quotes
-        return text.replace('"', '\\"')
-
-    @staticmethod
-    def _format_duration(seconds: int) -> str:
-        """Format duration as human-readable string."""
-        if seconds <= 0:
-            return "Unknown"
-
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
-
-        if hours > 0:
-            return f"{hours}:{minutes:02d}:{secs:02d}"
-        else:
-            return f"{minutes}:{secs:02d}"
-
-    def _ensure_unique_path(self, path: Path) -> Path:
-        """Ensure path is unique by adding counter if needed.
+        Each candidate is claimed with mkdir(exist_ok=False), so two notes
+        with the same title written at the same time never share a folder.
 
         Args:
-            path: Original path
+            path: Preferred folder path
 
         Returns:
-            Unique path
+            Path of the folder that was created
         """
-        if not path.exists():
-            return path
-
-        counter = 1
         base_name = path.name
-
-        while True:
-            new_path = path.parent / f"{base_name}_{counter}"
-            if not new_path.exists():
-                return new_path
-            counter += 1
-
-            # Safety limit
-            if counter > 100:
-                timestamp = datetime.now().strftime("%H%M%S")
-                return path.parent / f"{base_name}_{timestamp}"
+        prefix = f"{base_name}_"
+
+        # One directory read up front, so taken names are skipped without
+        # a failed mkdir each; mkdir still has the final say
+        try:
+            with os.scandir(path.parent) as entries:
+                existing = {
+                    entry.name
+                    for entry in entries
+                    if entry.name == base_name or entry.name.startswith(prefix)
+                }
+        except FileNotFoundError:
+            existing = set()
+
+        candidates = [base_name] + [f"{prefix}{counter}" for counter in range(1, 101)]
+        for name in candidates:
+            if name in existing:
+                continue
+            candidate = path.parent / name
+            try:
+                candidate.mkdir(parents=True)
+                return candidate
+            except FileExistsError:
+                continue
+
+        # Safety limit
+        timestamp = datetime.now().strftime("%H%M%S%f")
+        candidate = path.parent / f"{base_name}_{timestamp}"
+        candidate.mkdir(parents=True)
+        return candidate
 
@@ -1,15 +1,73 @@
 """Storage management for OAuth tokens (JSON) and processed files (SQLite)."""
 
 import os
+import base64
 import json
 import sqlite3
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# orjson, if installed, parses and serializes token files in C; the stdlib
+# json module is the fallback and writes the same compact JSON
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Token files are named TOKEN_FILE_PREFIX + url-safe base64 of the account
+# ID + ".json", so account IDs can be listed from file names alone. "." never
+# occurs in url-safe base64, so the prefix also tells these files apart from
+# the older sanitized names ("dbid_....json").
+TOKEN_FILE_PREFIX = "b64."
+
+
+def _encode_account_id(account_id: str) -> str:
+    """Encode an account ID for use in a file name (unpadded base64url)."""
+    return base64.urlsafe_b64encode(account_id.encode("utf-8")).decode().rstrip("=")
+
+
+def _decode_account_id(encoded: str) -> str:
+    """Reverse _encode_account_id.
+
+    Raises:
+        ValueError: If encoded isn't valid base64url
+    """
+    padded = encoded + "=" * (-len(encoded) % 4)
+    return base64.urlsafe_b64decode(padded).decode("utf-8")
+
+
+def _loads_token(data: bytes) -> Dict[str, Any]:
+    """Parse a token file's bytes.
+
+    Args:
+        data: Raw file content
+
+    Returns:
+        Token data dictionary
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_token(token_data: Dict[str, Any]) -> bytes:
+    """Serialize token data for a token file.
+
+    Args:
+        token_data: Token data dictionary
+
+    Returns:
+        UTF-8 encoded compact JSON (token files are only read by code)
+    """
+    if orjson is not None:
+        return orjson.dumps(token_data)
+    return json.dumps(token_data, separators=(",", ":")).encode("utf-8")
+
 
 class TokenStorage:
     """Manages OAuth tokens as JSON files, one per user."""
@@ -23,12 +81,51 @@ class TokenStorage:
         self.tokens_dir = Path(tokens_dir)
         self.tokens_dir.mkdir(parents=True, exist_ok=True)
 
+        # Serializes read-modify-write of sync state files
+        self._state_lock = threading.Lock()
+
+        # Parsed tokens keyed by account ID, with the file mtime they were
+        # read at; a changed mtime (e.g. another process wrote it) rereads
+        self._token_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
         # Set restrictive permissions on tokens directory
         try:
             os.chmod(self.tokens_dir, 0o700)
         except Exception as e:
             logger.warning(f"Could not set permissions on tokens directory: {e}")
 
+        self._migrate_legacy_token_files()
+
+    def _migrate_legacy_token_files(self):
+        """Rename token files from the old sanitized naming to the encoded one.
+
+        The old names replaced ":" and "/" with "_", which can't be reversed,
+        so each file is parsed once here for its account ID. The sync state
+        file moves along with its token.
+        """
+        migrated = 0
+        # Already-migrated files are told apart by name and never opened
+        for token_path, data in self._iter_tokens(legacy_only=True):
+            account_id = data["account_id"]
+            new_path = self._get_token_path(account_id)
+            try:
+                if new_path.exists():
+                    logger.warning(
+                        f"Keeping {new_path.name}; ignoring legacy token file "
+                        f"{os.path.basename(token_path)}"
+                    )
+                    continue
+                os.replace(token_path, new_path)
+                legacy_state = Path(token_path).with_suffix(".state")
+                if legacy_state.exists():
+                    os.replace(legacy_state, self._get_state_path(account_id))
+                migrated += 1
+            except OSError as e:
+                logger.warning(f"Could not migrate token file {token_path}: {e}")
+
+        if migrated:
+            logger.info(f"Migrated {migrated} token file(s) to encoded names")
+
     def _get_token_path(self, account_id: str) -> Path:
         """Get path to token file for an account.
 
@@ -38,9 +135,24 @@ class TokenStorage:
         Returns:
             Path to token JSON file
         """
-        # Sanitize account ID for filename
-        safe_id = account_id.replace(":", "_").replace("/", "_")
-        return self.tokens_dir / f"{safe_id}.json"
+        # Reversible encoding, so list_accounts can read IDs from file names
+        return self.tokens_dir / (
+            f"{TOKEN_FILE_PREFIX}{_encode_account_id(account_id)}.json"
+        )
+
+    def _get_state_path(self, account_id: str) -> Path:
+        """Get path to the sync state file for an account.
+
+        Kept next to the token file but with a different suffix, so
+        list_accounts only sees tokens.
+
+        Args:
+            account_id: Dropbox account ID
+
+        Returns:
+            Path to state file
+        """
+        return self._get_token_path(account_id).with_suffix(".state")
 
     def save_token(self, token_data: Dict[str, Any]) -> None:
         """Save or update token data for a user.
@@ -65,8 +177,7 @@ class TokenStorage:
             token_data["authorized_at"] = token_data["updated_at"]
 
         # Write token file
-        with open(token_path, "w") as f:
-            json.dump(token_data, f, indent=2)
+        token_path.write_bytes(_dumps_token(token_data))
 
         # Set restrictive permissions
         try:
@@ -74,6 +185,12 @@ class TokenStorage:
         except Exception as e:
             logger.warning(f"Could not set permissions on token file: {e}")
 
+        # Write-through: later loads hit memory until the file changes again
+        self._token_cache[account_id] = (
+            token_path.stat().st_mtime_ns,
+            dict(token_data),
+        )
+
         logger.info(f"Saved token for account: {account_id}")
 
     def load_token(self, account_id: str) -> Optional[Dict[str, Any]]:
@@ -87,16 +204,86 @@ class TokenStorage:
         """
         token_path = self._get_token_path(account_id)
 
-        if not token_path.exists():
-            return None
-
         try:
-            with open(token_path, "r") as f:
-                return json.load(f)
+            mtime = token_path.stat().st_mtime_ns
+            cached = self._token_cache.get(account_id)
+            if cached and cached[0] == mtime:
+                # Copy, so callers can update and save without touching the cache
+                return dict(cached[1])
+
+            # Parsed from bytes directly, skipping the text-mode decoder
+            token_data = _loads_token(token_path.read_bytes())
+            self._token_cache[account_id] = (mtime, token_data)
+            return dict(token_data)
+        except FileNotFoundError:
+            self._token_cache.pop(account_id, None)
+            return None
         except Exception as e:
             logger.error(f"Error loading token for {account_id}: {e}")
             return None
 
+    def load_state(self, account_id: str) -> Dict[str, Any]:
+        """Load the persisted sync state for an account.
+
+        Args:
+            account_id: Dropbox account ID
+
+        Returns:
+            State dictionary (empty if none was saved)
+        """
+        try:
+            return json.loads(self._get_state_path(account_id).read_bytes())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Error loading sync state for {account_id}: {e}")
+            return {}
+
+    def update_state(self, account_id: str, **fields: Any) -> None:
+        """Merge fields into the persisted sync state for an account.
+
+        Written to a temp file and renamed into place, so a crash never
+        leaves a torn state file behind.
+
+        Args:
+            account_id: Dropbox account ID
+            **fields: State fields to set
+        """
+        state_path = self._get_state_path(account_id)
+        tmp_path = state_path.with_suffix(".state.tmp")
+
+        with self._state_lock:
+            state = self.load_state(account_id)
+            state.update(fields)
+
+            try:
+                with open(tmp_path, "w") as f:
+                    json.dump(state, f)
+                os.chmod(tmp_path, 0o600)
+                os.replace(tmp_path, state_path)
+            except Exception as e:
+                logger.warning(f"Error saving sync state for {account_id}: {e}")
+
+    def load_cursor(self, account_id: str) -> Optional[str]:
+        """Load the persisted Dropbox delta cursor for an account.
+
+        Args:
+            account_id: Dropbox account ID
+
+        Returns:
+            Cursor string or None if none was saved
+        """
+        return self.load_state(account_id).get("cursor")
+
+    def save_cursor(self, account_id: str, cursor: Optional[str]) -> None:
+        """Persist the Dropbox delta cursor for an account.
+
+        Args:
+            account_id: Dropbox account ID
+            cursor: Cursor string, or None to forget it
+        """
+        self.update_state(account_id, cursor=cursor)
+
     def delete_token(self, account_id: str) -> bool:
         """Delete token for a user.
 
@@ -108,28 +295,66 @@ class TokenStorage:
         """
         token_path = self._get_token_path(account_id)
 
+        self._get_state_path(account_id).unlink(missing_ok=True)
+        self._token_cache.pop(account_id, None)
+
         if token_path.exists():
             token_path.unlink()
             logger.info(f"Deleted token for account: {account_id}")
             return True
         return False
 
+    def _iter_tokens(
+        self, legacy_only: bool = False
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Read and parse each token file once.
+
+        Args:
+            legacy_only: Only read files still using the old naming
+
+        Yields:
+            (token file path, token data) for every readable token file
+        """
+        # scandir's cached entry types avoid a stat per file
+        with os.scandir(self.tokens_dir) as entries:
+            token_paths = [
+                entry.path
+                for entry in entries
+                if entry.name.endswith(".json")
+                and not (legacy_only and entry.name.startswith(TOKEN_FILE_PREFIX))
+                and entry.is_file(follow_symlinks=False)
+            ]
+
+        for token_path in token_paths:
+            try:
+                with open(token_path, "rb") as f:
+                    data = _loads_token(f.read())
+            except Exception as e:
+                logger.warning(f"Error reading token file {token_path}: {e}")
+                continue
+            if "account_id" in data:
+                yield token_path, data
+
     def list_accounts(self) -> List[str]:
         """List all authorized account IDs.
 
         Returns:
             List of account IDs
         """
-        accounts = []
-        for token_file in self.tokens_dir.glob("*.json"):
-            try:
-                with open(token_file, "r") as f:
-                    data = json.load(f)
-                    if "account_id" in data:
-                        accounts.append(data["account_id"])
-            except Exception as e:
-                logger.warning(f"Error reading token file {token_file}: {e}")
-        return accounts
+        # Account IDs are encoded in the file names; no file is opened
+        account_ids = []
+        with os.scandir(self.tokens_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith(TOKEN_FILE_PREFIX) and name.endswith(".json")):
+                    continue
+                try:
+                    account_ids.append(
+                        _decode_account_id(name[len(TOKEN_FILE_PREFIX) : -5])
+                    )
+                except ValueError as e:
+                    logger.warning(f"Unrecognized token file name {name}: {e}")
+        return account_ids
 
     def get_all_tokens(self) -> List[Dict[str, Any]]:
         """Get all stored tokens.
@@ -137,12 +362,7 @@ class TokenStorage:
         Returns:
             List of token data dictionaries
         """
-        tokens = []
-        for account_id in self.list_accounts():
-            token = self.load_token(account_id)
-            if token:
-                tokens.append(token)
-        return tokens
+        return [data for _, data in self._iter_tokens()]
 
 
 class ProcessedFilesDB:
@@ -155,11 +375,45 @@ class ProcessedFilesDB:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+
+        # One connection for the process lifetime, so each query skips the
+        # open and PRAGMA setup. Jobs run on several threads; the lock
+        # serializes use of the shared connection.
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
         self._init_db()
 
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection tuning applied.
+
+        Returns:
+            SQLite connection
+        """
+        # Autocommit: each statement is its own transaction, no commit()
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        # WAL only syncs on checkpoints, so NORMAL is still crash-safe
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-20000")
+        return conn
+
     def _init_db(self):
         """Create database schema if it doesn't exist."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self._conn
+            # Persistent on the database file: readers no longer block
+            # writers, and commits append to the WAL instead of syncing a
+            # rollback journal
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS processed_files (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -172,15 +426,21 @@ class ProcessedFilesDB:
                     output_path TEXT
                 )
             """)
+            # Covers is_processed, so the check never reads the table row.
+            # The UNIQUE constraint already indexes file_path on its own.
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_file_path
-                ON processed_files(file_path)
+                CREATE INDEX IF NOT EXISTS idx_path_status
+                ON processed_files(file_path, status)
             """)
+            conn.execute("DROP INDEX IF EXISTS idx_file_path")
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_account_id
                 ON processed_files(account_id)
             """)
-            conn.commit()
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_file_hash
+                ON processed_files(file_hash)
+            """)
         logger.info("Initialized processed files database")
 
     def is_processed(self, file_path: str) -> bool:
@@ -192,13 +452,48 @@ class ProcessedFilesDB:
         Returns:
             True if file has been processed successfully
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT status FROM processed_files WHERE file_path = ?",
+        with self._lock:
+            # INDEXED BY: the planner would otherwise pick the UNIQUE index
+            # on file_path and still fetch the row to check status
+            cursor = self._conn.execute(
+                "SELECT 1 FROM processed_files INDEXED BY idx_path_status"
+                " WHERE file_path = ? AND status = 'success' LIMIT 1",
                 (file_path,),
             )
+            return cursor.fetchone() is not None
+
+    def find_by_video_id(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Find the most recent successful job for a video.
+
+        Successful jobs store the video ID as file_hash, so the same URL
+        submitted from a different job file can be recognized.
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            Dictionary with file_path, processed_at and output_path, or None
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                SELECT file_path, processed_at, output_path
+                FROM processed_files
+                WHERE file_hash = ? AND status = 'success'
+                ORDER BY processed_at DESC
+                LIMIT 1
+            """,
+                (video_id,),
+            )
             result = cursor.fetchone()
-            return result is not None and result[0] == "success"
+
+        if result is None:
+            return None
+        return {
+            "file_path": result[0],
+            "processed_at": result[1],
+            "output_path": result[2],
+        }
 
     def mark_processed(
         self,
@@ -213,34 +508,74 @@ class ProcessedFilesDB:
 
         Args:
             file_path: Path or identifier of the file
-            status: Processing status ('success', 'error', 'skipped')
+            status: Processing status ('success', 'error', 'skipped',
+                'duplicate')
             account_id: Dropbox account ID (for multi-tenant tracking)
             file_hash: File content hash (for duplicate detection)
             error_message: Error message if status is 'error'
             output_path: Path to output file if status is 'success'
         """
-        processed_at = datetime.utcnow().isoformat()
+        self.mark_processed_bulk(
+            [
+                {
+                    "file_path": file_path,
+                    "status": status,
+                    "account_id": account_id,
+                    "file_hash": file_hash,
+                    "error_message": error_message,
+                    "output_path": output_path,
+                }
+            ]
+        )
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO processed_files
-                (file_path, file_hash, account_id, processed_at, status, error_message, output_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    file_path,
-                    file_hash,
-                    account_id,
-                    processed_at,
-                    status,
-                    error_message,
-                    output_path,
-                ),
+        logger.debug(f"Marked file as processed: {file_path} (status: {status})")
+
+    def mark_processed_bulk(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Mark several files as processed in one transaction.
+
+        One commit (and WAL sync) for the whole batch instead of one per
+        file.
+
+        Args:
+            records: Dictionaries with the keyword arguments of
+                mark_processed (file_path and status are required)
+
+        Returns:
+            Number of records written
+        """
+        processed_at = datetime.utcnow().isoformat()
+        rows = [
+            (
+                record["file_path"],
+                record.get("file_hash"),
+                record.get("account_id"),
+                processed_at,
+                record["status"],
+                record.get("error_message"),
+                record.get("output_path"),
             )
-            conn.commit()
+            for record in records
+        ]
+        if not rows:
+            return 0
 
-        logger.debug(f"Marked file as processed: {file_path} (status: {status})")
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO processed_files
+                    (file_path, file_hash, account_id, processed_at, status, error_message, output_path)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    rows,
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+        return len(rows)
 
     def get_stats(self, account_id: Optional[str] = None) -> Dict[str, int]:
         """Get processing statistics.
@@ -251,9 +586,9 @@ class ProcessedFilesDB:
         Returns:
             Dictionary with counts by status
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
             if account_id:
-                cursor = conn.execute(
+                cursor = self._conn.execute(
                     """
                     SELECT status, COUNT(*)
                     FROM processed_files
@@ -263,7 +598,7 @@ class ProcessedFilesDB:
                     (account_id,),
                 )
             else:
-                cursor = conn.execute("""
+                cursor = self._conn.execute("""
                     SELECT status, COUNT(*)
                     FROM processed_files
                     GROUP BY status
@@ -1,9 +1,12 @@
 """Tag management system for VoxBox."""
 
 import logging
+import os
 import re
+import threading
+from itertools import islice
 from pathlib import Path
-from typing import List, Set, Optional
+from typing import Iterator, List, Set, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +34,81 @@ DEFAULT_TAGS = [
     "finance",
 ]
 
+# Lines of frontmatter read from a note before giving up on finding tags
+FRONTMATTER_MAX_LINES = 100
+
+# One "  - tag" item of a YAML tags block; anchored at the end so an item
+# with other characters is skipped rather than learned truncated
+TAG_ITEM_RE = re.compile(rb"\s+-\s+([A-Za-z0-9_-]+)\s*$")
+
+# Allowed tag characters, and names reserved for VoxBox's own folders
+VALID_TAG_RE = re.compile(r"[a-z0-9_-]+")
+RESERVED_TAGS = frozenset(
+    ["uncategorized", "logs", "archive", "inbox", "outbox", "temp"]
+)
+
+
+def _iter_markdown_files(root: Path) -> Iterator[str]:
+    """Yield paths of the .md files one folder below root.
+
+    Uses os.scandir, whose entries carry the file type from the directory
+    listing, instead of iterdir() + is_dir() + glob(), which stat every
+    entry again and build a Path for each.
+
+    Args:
+        root: Outbox directory
+
+    Yields:
+        Markdown file paths
+    """
+    with os.scandir(root) as folders:
+        for folder in folders:
+            if not folder.is_dir(follow_symlinks=False):
+                continue
+            try:
+                with os.scandir(folder.path) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".md") and entry.is_file():
+                            yield entry.path
+            except OSError as e:
+                logger.debug(f"Could not scan {folder.path}: {e}")
+
+
+def _read_frontmatter_tags(path: str) -> List[str]:
+    """Read the tag list from a note's YAML frontmatter.
+
+    Reads line by line and stops as soon as the tags block or the
+    frontmatter ends, so the note body is never read. Lines are matched as
+    bytes; only tag names are decoded.
+
+    Args:
+        path: Markdown file path
+
+    Returns:
+        Tag names as written (empty if there is no frontmatter or no tags)
+    """
+    tags = []
+    with open(path, "rb") as f:
+        if not f.readline().startswith(b"---"):
+            return tags
+
+        in_tags = False
+        for line in islice(f, FRONTMATTER_MAX_LINES):
+            if in_tags:
+                match = TAG_ITEM_RE.match(line)
+                if not match:
+                    # Skip items with other characters; anything that is
+                    # not a list item ends the tags block
+                    if line[:1].isspace() and line.lstrip().startswith(b"-"):
+                        continue
+                    break
+                tags.append(match.group(1).decode("ascii"))
+            elif line.startswith(b"tags:"):
+                in_tags = True
+            elif line.startswith(b"---"):
+                break
+    return tags
+
 
 class TagManager:
     """Manages tags from tags.txt and learns from existing filenames."""
@@ -64,6 +142,11 @@ class TagManager:
         if not self.tags_file.exists():
             self._create_default_tags_file()
 
+        # ((outbox mtime, tags.txt mtime), tags) from the last scan. A new
+        # note folder or an edit to tags.txt changes the key.
+        self._tags_cache: Optional[Tuple[Tuple[int, int], List[str]]] = None
+        self._tags_lock = threading.Lock()
+
     def _create_default_tags_file(self):
         """Create tags.txt with default tags."""
         try:
@@ -113,33 +196,14 @@ class TagManager:
         learned_tags = set()
 
         try:
-            for folder in self.outbox_dir.iterdir():
-                if not folder.is_dir():
-                    continue
-
-                # Look for markdown files in folders
-                for md_file in folder.glob("*.md"):
-                    try:
-                        with open(md_file, "r", encoding="utf-8") as f:
-                            content = f.read(2000)  # Just read frontmatter area
-
-                        # Extract tags from YAML frontmatter
-                        if content.startswith("---"):
-                            frontmatter_end = content.find("---", 3)
-                            if frontmatter_end > 0:
-                                frontmatter = content[3:frontmatter_end]
-                                # Find tags section
-                                tags_match = re.search(
-                                    r"tags:\s*\n((?:\s+-\s+\w+\n?)+)", frontmatter
-                                )
-                                if tags_match:
-                                    tag_lines = tags_match.group(1)
-                                    for match in re.finditer(r"-\s+(\w+)", tag_lines):
-                                        tag = match.group(1).lower()
-                                        if self._is_valid_tag(tag):
-                                            learned_tags.add(tag)
-                    except Exception as e:
-                        logger.debug(f"Could not read {md_file}: {e}")
+            for md_path in _iter_markdown_files(self.outbox_dir):
+                try:
+                    for tag in _read_frontmatter_tags(md_path):
+                        tag = tag.lower()
+                        if self._is_valid_tag(tag):
+                            learned_tags.add(tag)
+                except Exception as e:
+                    logger.debug(f"Could not read {md_path}: {e}")
 
             if learned_tags:
                 logger.debug(
@@ -166,11 +230,11 @@ class TagManager:
         if not tag or len(tag) < 2 or len(tag) > 30:
             return False
 
-        if not re.match(r"^[a-z0-9_-]+$", tag):
+        if not VALID_TAG_RE.fullmatch(tag):
             return False
 
         # Reserved names
-        if tag in ["uncategorized", "logs", "archive", "inbox", "outbox", "temp"]:
+        if tag in RESERVED_TAGS:
             return False
 
         return True
@@ -178,9 +242,57 @@ class TagManager:
     def get_available_tags(self) -> List[str]:
         """Get all available tags (from file + learned).
 
+        Results are cached until the outbox or tags.txt changes, so a burst
+        of jobs scans the vault once instead of once per video.
+
+        Returns:
+            Sorted list of unique tag names
+        """
+        # Fast path without the lock: the cache is replaced as a whole
+        # tuple, so a reader sees either the old or the new entry
+        key = self._cache_key()
+        cached = self._tags_cache
+        if cached and cached[0] == key:
+            return list(cached[1])
+
+        with self._tags_lock:
+            # Another job may have rescanned while we waited
+            key = self._cache_key()
+            cached = self._tags_cache
+            if cached and cached[0] == key:
+                return list(cached[1])
+
+            sorted_tags = self._scan_tags()
+            self._tags_cache = (key, sorted_tags)
+            return list(sorted_tags)
+
+    def invalidate(self):
+        """Drop the cached tag list, e.g. after writing a new note."""
+        self._tags_cache = None
+
+    def _cache_key(self) -> Tuple[int, int]:
+        """Modification times that decide whether cached tags are current.
+
+        Returns:
+            (outbox mtime, tags.txt mtime) in nanoseconds, 0 if missing
+        """
+        try:
+            outbox_mtime = os.stat(self.outbox_dir).st_mtime_ns
+        except OSError:
+            outbox_mtime = 0
+        try:
+            tags_mtime = os.stat(self.tags_file).st_mtime_ns
+        except OSError:
+            tags_mtime = 0
+        return outbox_mtime, tags_mtime
+
+    def _scan_tags(self) -> List[str]:
+        """Read tags.txt and learn tags from existing notes.
+
         Returns:
             Sorted list of unique tag names
         """
+
         # Load from tags.txt
         file_tags = self._load_tags_from_file()
 
@@ -214,21 +326,24 @@ class TagManager:
             logger.warning(f"Invalid tag name: {tag}")
             return False
 
-        # Check if already exists
-        existing_tags = self._load_tags_from_file()
-        if tag in existing_tags:
-            logger.debug(f"Tag already exists: {tag}")
-            return True
-
-        try:
-            # Append to file
-            with open(self.tags_file, "a", encoding="utf-8") as f:
-                f.write(f"\n{tag}")
-
-            logger.info(f"Added new tag to tags.txt: {tag}")
-            return True
-
-        except Exception as e:
-            logger.error(f"Error adding tag to tags.txt: {e}")
-            return False
+        # Held across check and append, so concurrent jobs can't add a tag twice
+        with self._tags_lock:
+            # Check if already exists
+            existing_tags = self._load_tags_from_file()
+            if tag in existing_tags:
+                logger.debug(f"Tag already exists: {tag}")
+                return True
+
+            try:
+                # Append to file
+                with open(self.tags_file, "a", encoding="utf-8") as f:
+                    f.write(f"\n{tag}")
+                self.invalidate()
+
+                logger.info(f"Added new tag to tags.txt: {tag}")
+                return True
+
+            except Exception as e:
+                logger.error(f"Error adding tag to tags.txt: {e}")
+                return False
 
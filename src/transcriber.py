@@ -1,14 +1,49 @@
 """Transcription with YouTube captions priority and Whisper fallback."""
 
+import codecs
+import gc
 import logging
+import mmap
+import os
 import re
+import subprocess
+import tempfile
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List
-import webvtt
+from typing import Iterable, Iterator, Optional, List
 
 logger = logging.getLogger(__name__)
 
+# Audio longer than this (seconds) is transcribed in pieces, so Whisper's
+# memory use is bounded by the chunk length instead of the video length
+WHISPER_CHUNK_THRESHOLD = 3600
+
+# Length of each piece, and how far each one reaches back into the previous
+# piece so words at the boundary aren't cut
+WHISPER_CHUNK_SECONDS = 1800
+WHISPER_CHUNK_OVERLAP = 5
+
+# VTT cue timestamp, "HH:MM:SS.mmm" or "MM:SS.mmm" (a comma is accepted
+# too, as in SRT); anything else goes through the slower generic parse
+VTT_TIMESTAMP_RE = re.compile(rb"(?:(\d+):)?(\d{2}):(\d{2})[.,](\d{3})")
+
+# Caption noise stripped by _clean_caption_text: HTML/VTT markup such as
+# <c> or <00:00:01.000>, and labels like "[Music]" or "(applause)"
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+BRACKET_LABEL_RE = re.compile(r"\[[^\]]*\]")
+PAREN_LABEL_RE = re.compile(r"\([^)]*\)")
+
+
+def _cuda_available() -> bool:
+    """Check whether CTranslate2 (faster-whisper's backend) can use a GPU."""
+    try:
+        import ctranslate2
+
+        return ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        return False
+
 
 @dataclass
 class TranscriptSegment:
@@ -41,22 +76,34 @@ class TranscriptResult:
         Returns:
             Formatted transcript with timestamps
         """
-        if not self.segments:
-            return ""
+        return "".join(self.iter_with_timestamps(interval_seconds))
+
+    def iter_with_timestamps(self, interval_seconds: int = 60) -> Iterator[str]:
+        """Yield the timestamped transcript piece by piece.
+
+        Joining the pieces gives format_with_timestamps; callers that only
+        need to write or measure the transcript can consume them directly
+        instead of building the whole string.
+
+        Args:
+            interval_seconds: Insert timestamp every N seconds
 
-        lines = []
+        Yields:
+            Consecutive pieces of the formatted transcript
+        """
         last_timestamp = -interval_seconds  # Ensure first timestamp is shown
+        separator = ""
 
         for segment in self.segments:
             # Add timestamp if enough time has passed
             if segment.start - last_timestamp >= interval_seconds:
                 timestamp = self._format_timestamp(segment.start)
-                lines.append(f"\n({timestamp})")
+                yield f"{separator}\n({timestamp})" if separator else f"({timestamp})"
+                separator = " "
                 last_timestamp = segment.start
 
-            lines.append(segment.text)
-
-        return " ".join(lines).strip()
+            yield f"{separator}{segment.text}"
+            separator = " "
 
     @staticmethod
     def _format_timestamp(seconds: float) -> str:
@@ -74,20 +121,86 @@ class TranscriptResult:
 class Transcriber:
     """Handles transcription with YouTube captions and Whisper fallback."""
 
-    def __init__(self, whisper_model: str = "base"):
+    def __init__(
+        self,
+        whisper_model: str = "base",
+        device: str = "auto",
+        compute_type: Optional[str] = None,
+        beam_size: int = 5,
+        vad_filter: bool = True,
+        num_workers: int = 1,
+    ):
         """Initialize transcriber.
 
         Args:
             whisper_model: Whisper model size for fallback transcription
+            device: "cpu", "cuda", or "auto" to use a GPU when one is visible
+            compute_type: CTranslate2 compute type; None picks int8_float16
+                on GPU and int8 on CPU
+            beam_size: Beam width for decoding (1 is greedy and fastest)
+            vad_filter: Skip non-speech audio before decoding
+            num_workers: Transcriptions the model may run in parallel, e.g.
+                the number of concurrent jobs
         """
         self.whisper_model = whisper_model
+        self.device = device
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.vad_filter = vad_filter
+        self.num_workers = num_workers
         self._whisper_model_instance = None
 
+        # Jobs run concurrently; make sure only one of them loads the weights
+        self._load_lock = threading.Lock()
+
+    def load(self):
+        """Load the Whisper model once and keep it for later transcriptions.
+
+        Safe to call repeatedly and from several threads.
+
+        Raises:
+            ImportError: If faster-whisper is not installed
+        """
+        if self._whisper_model_instance is not None:
+            return
+
+        with self._load_lock:
+            if self._whisper_model_instance is None:
+                from faster_whisper import WhisperModel
+
+                device = self.device
+                if device == "auto":
+                    device = "cuda" if _cuda_available() else "cpu"
+                compute_type = self.compute_type or (
+                    "int8_float16" if device == "cuda" else "int8"
+                )
+
+                logger.info(
+                    f"Loading Whisper model: {self.whisper_model} "
+                    f"({device}, {compute_type})"
+                )
+                self._whisper_model_instance = WhisperModel(
+                    self.whisper_model,
+                    device=device,
+                    compute_type=compute_type,
+                    num_workers=self.num_workers,
+                )
+
+    def close(self):
+        """Release the Whisper model, if it was loaded."""
+        with self._load_lock:
+            if self._whisper_model_instance is not None:
+                self._whisper_model_instance = None
+                # CTranslate2 weights are only freed once the model is collected
+                gc.collect()
+                logger.info("Released Whisper model")
+
     def transcribe(
         self,
         audio_path: str,
         caption_path: Optional[str] = None,
         caption_source: Optional[str] = None,
+        duration: Optional[int] = 0,
     ) -> TranscriptResult:
         """Transcribe audio, preferring YouTube captions if available.
 
@@ -95,51 +208,117 @@ class Transcriber:
             audio_path: Path to audio file (MP3)
             caption_path: Path to caption file (.vtt) if available
             caption_source: Source of captions ("manual" or "auto")
+            duration: Audio length in seconds, if known; long audio is
+                transcribed in chunks
 
         Returns:
             TranscriptResult with segments and source info
         """
         # Try YouTube captions first
         if caption_path and Path(caption_path).exists():
-            logger.info(f"Using YouTube captions ({caption_source}): {caption_path}")
             try:
-                result = self._parse_vtt_captions(caption_path)
-                result.source = f"youtube_{caption_source}" if caption_source else "youtube"
-                return result
+                return self.parse_captions_only(caption_path, caption_source)
             except Exception as e:
                 logger.warning(f"Failed to parse captions, falling back to Whisper: {e}")
 
         # Fallback to Whisper
         logger.info(f"Using Whisper ({self.whisper_model}) for transcription")
+        # yt-dlp reports no duration for some videos (live/premiere VODs)
+        if (duration or 0) > WHISPER_CHUNK_THRESHOLD:
+            return self.transcribe_chunked(audio_path, duration)
         return self._transcribe_with_whisper(audio_path)
 
-    def _parse_vtt_captions(self, vtt_path: str) -> TranscriptResult:
-        """Parse VTT caption file into transcript segments.
+    def parse_captions_only(
+        self, caption_path: str, caption_source: Optional[str] = None
+    ) -> TranscriptResult:
+        """Build a transcript from YouTube captions alone.
+
+        Never touches Whisper, so no model is loaded and no audio decoded.
 
         Args:
-            vtt_path: Path to .vtt file
+            caption_path: Path to caption file (.vtt)
+            caption_source: Source of captions ("manual" or "auto")
 
         Returns:
-            TranscriptResult with parsed segments
+            TranscriptResult with caption segments
+
+        Raises:
+            Exception: If the caption file can't be parsed
         """
-        segments = []
+        logger.info(f"Using YouTube captions ({caption_source}): {caption_path}")
+        result = self._parse_vtt_captions(caption_path)
+        result.source = f"youtube_{caption_source}" if caption_source else "youtube"
+        return result
 
-        try:
-            captions = webvtt.read(vtt_path)
+    def transcribe_chunked(
+        self,
+        audio_path: str,
+        duration: int,
+        chunk_seconds: int = WHISPER_CHUNK_SECONDS,
+        overlap: int = WHISPER_CHUNK_OVERLAP,
+    ) -> TranscriptResult:
+        """Transcribe long audio with Whisper one chunk at a time.
+
+        Each chunk is cut with ffmpeg (stream copy, no re-encode), transcribed
+        and freed before the next one, and its segments are shifted back to
+        the position in the full recording.
+
+        Args:
+            audio_path: Path to audio file
+            duration: Audio length in seconds
+            chunk_seconds: Length of each chunk
+            overlap: Seconds each chunk starts before its boundary
+
+        Returns:
+            TranscriptResult covering the whole recording
+        """
+        segments: List[TranscriptSegment] = []
+        language = None
+        suffix = Path(audio_path).suffix
+
+        with tempfile.TemporaryDirectory(prefix="whisper-chunks-") as tmp_dir:
+            for boundary in range(0, int(duration), chunk_seconds):
+                start = max(0, boundary - overlap)
+                chunk_path = str(Path(tmp_dir) / f"chunk{suffix}")
+
+                length = boundary + chunk_seconds - start
+                cmd = ["ffmpeg", "-v", "error", "-y", "-ss", str(start)]
+                cmd += ["-t", str(length), "-i", audio_path]
+                cmd += ["-vn", "-c", "copy", chunk_path]
+                subprocess.run(cmd, check=True)
+
+                logger.info(
+                    f"Transcribing chunk {boundary // chunk_seconds + 1} "
+                    f"of {-(-int(duration) // chunk_seconds)}"
+                )
+                result = self._transcribe_with_whisper(chunk_path)
+                language = language or result.language
+
+                # The overlap was already covered by the previous chunk
+                for segment in result.segments:
+                    segment.start += start
+                    segment.end += start
+                    if segment.start >= boundary:
+                        segments.append(segment)
+
+                del result
+                gc.collect()
 
-            for caption in captions:
-                # Parse timestamps
-                start = self._vtt_time_to_seconds(caption.start)
-                end = self._vtt_time_to_seconds(caption.end)
+        return TranscriptResult(segments=segments, source="whisper", language=language)
 
-                # Clean text (remove HTML tags, extra whitespace)
-                text = self._clean_caption_text(caption.text)
+    def _parse_vtt_captions(self, vtt_path: str) -> TranscriptResult:
+        """Parse VTT caption file into transcript segments.
 
-                if text:  # Skip empty segments
-                    segments.append(TranscriptSegment(start=start, end=end, text=text))
+        Args:
+            vtt_path: Path to .vtt file
 
+        Returns:
+            TranscriptResult with parsed segments
+        """
+        try:
             # Merge duplicate/overlapping segments (common in auto-captions)
-            segments = self._merge_segments(segments)
+            # as they are parsed, without an intermediate list of raw cues
+            segments = self._merge_segments(self._iter_vtt_segments(vtt_path))
 
             logger.info(f"Parsed {len(segments)} caption segments from VTT")
 
@@ -149,17 +328,97 @@ class Transcriber:
 
         return TranscriptResult(segments=segments, source="youtube")
 
+    def _iter_vtt_segments(self, vtt_path: str) -> Iterator[TranscriptSegment]:
+        """Read cues from a WebVTT file as cleaned transcript segments.
+
+        A single pass over the lines: a line with "-->" starts a cue and
+        the lines up to the next blank line are its text. The header,
+        NOTE/STYLE/REGION blocks and cue identifiers never contain "-->",
+        so they are skipped without being parsed.
+
+        The file is memory-mapped and scanned as bytes; only cue text is
+        decoded, and timestamps are parsed from the bytes.
+
+        Args:
+            vtt_path: Path to .vtt file
+
+        Yields:
+            One segment per cue with non-empty text
+
+        Raises:
+            ValueError: If the file doesn't start with a WEBVTT header
+        """
+        with open(vtt_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"Not a WebVTT file: {vtt_path}")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = 3 if mm[:3] == codecs.BOM_UTF8 else 0
+                if mm[pos : pos + 6] != b"WEBVTT":
+                    raise ValueError(f"Not a WebVTT file: {vtt_path}")
+
+                size = len(mm)
+                find = mm.find
+                timing = None
+                text_lines: List[bytes] = []
+                while pos <= size:
+                    # A missing final newline reads as one more (blank) line
+                    # at EOF, which flushes the last cue
+                    end = find(b"\n", pos)
+                    if end < 0:
+                        end = size
+                    line = mm[pos:end].strip()
+                    pos = end + 1
+
+                    if timing is None:
+                        if b"-->" in line:
+                            timing = line
+                        continue
+                    if line:
+                        text_lines.append(line)
+                        if pos <= size:
+                            continue
+
+                    # Blank line: the cue is complete. The end time may be
+                    # followed by cue settings ("align:start position:0%").
+                    start_stamp, _, rest = timing.partition(b"-->")
+                    end_stamp = rest.split(None, 1)[0]
+                    timing = None
+
+                    # Clean text (remove HTML tags, extra whitespace)
+                    text = self._clean_caption_text(
+                        b" ".join(text_lines).decode("utf-8", errors="replace")
+                    )
+                    text_lines.clear()
+
+                    if text:  # Skip empty segments
+                        yield TranscriptSegment(
+                            start=self._vtt_time_to_seconds(start_stamp.strip()),
+                            end=self._vtt_time_to_seconds(end_stamp),
+                            text=text,
+                        )
+
     @staticmethod
-    def _vtt_time_to_seconds(time_str: str) -> float:
+    def _vtt_time_to_seconds(stamp: bytes) -> float:
         """Convert VTT timestamp to seconds.
 
         Args:
-            time_str: Timestamp in format "HH:MM:SS.mmm" or "MM:SS.mmm"
+            stamp: Timestamp bytes in format "HH:MM:SS.mmm" or "MM:SS.mmm"
 
         Returns:
             Time in seconds as float
         """
-        parts = time_str.replace(",", ".").split(":")
+        match = VTT_TIMESTAMP_RE.fullmatch(stamp)
+        if match:
+            # Whole milliseconds as an int, divided once: no float parsing
+            # and no rounding from adding float seconds to the minutes.
+            # int() reads the ASCII digit groups straight from bytes.
+            hours, minutes, seconds, millis = match.groups()
+            total_ms = (
+                (int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)
+            ) * 1000 + int(millis)
+            return total_ms / 1000
+
+        parts = stamp.replace(b",", b".").split(b":")
 
         if len(parts) == 3:
             hours, minutes, seconds = parts
@@ -168,7 +427,7 @@ class Transcriber:
             minutes, seconds = parts
             return int(minutes) * 60 + float(seconds)
         else:
-            return float(time_str)
+            return float(stamp)
 
     @staticmethod
     def _clean_caption_text(text: str) -> str:
@@ -181,11 +440,11 @@ class Transcriber:
             Cleaned text
         """
         # Remove HTML tags
-        text = re.sub(r"<[^>]+>", "", text)
+        text = HTML_TAG_RE.sub("", text)
 
         # Remove speaker labels like "[Music]" or "(applause)"
-        text = re.sub(r"\[[^\]]*\]", "", text)
-        text = re.sub(r"\([^)]*\)", "", text)
+        text = BRACKET_LABEL_RE.sub("", text)
+        text = PAREN_LABEL_RE.sub("", text)
 
         # Normalize whitespace
         text = " ".join(text.split())
@@ -193,22 +452,25 @@ class Transcriber:
         return text.strip()
 
     @staticmethod
-    def _merge_segments(segments: List[TranscriptSegment]) -> List[TranscriptSegment]:
+    def _merge_segments(
+        segments: Iterable[TranscriptSegment],
+    ) -> List[TranscriptSegment]:
         """Merge adjacent segments with identical or overlapping text.
 
         YouTube auto-captions often have overlapping/duplicate segments.
 
         Args:
-            segments: List of transcript segments
+            segments: Transcript segments in time order; any iterable, so
+                a parser can stream them in
 
         Returns:
             Merged segments with duplicates removed
         """
-        if not segments:
-            return []
-
         merged = []
         seen_texts = set()
+        # Normalized text of merged[-1], kept from when it was added so
+        # each segment's text is stripped and lowered only once
+        last_clean = None
 
         for segment in segments:
             # Clean and normalize text for comparison
@@ -219,10 +481,7 @@ class Transcriber:
                 continue
 
             # Check if this is a substring of the previous segment or vice versa
-            if merged:
-                last = merged[-1]
-                last_clean = last.text.strip().lower()
-
+            if last_clean is not None:
                 # Skip if current is subset of previous
                 if clean_text in last_clean:
                     continue
@@ -232,10 +491,12 @@ class Transcriber:
                     merged[-1] = segment
                     seen_texts.discard(last_clean)
                     seen_texts.add(clean_text)
+                    last_clean = clean_text
                     continue
 
             merged.append(segment)
             seen_texts.add(clean_text)
+            last_clean = clean_text
 
         return merged
 
@@ -249,23 +510,15 @@ class Transcriber:
             TranscriptResult with Whisper segments
         """
         try:
-            from faster_whisper import WhisperModel
-
-            # Lazy load model
-            if self._whisper_model_instance is None:
-                logger.info(f"Loading Whisper model: {self.whisper_model}")
-                self._whisper_model_instance = WhisperModel(
-                    self.whisper_model,
-                    device="cpu",
-                    compute_type="int8",
-                )
+            # Lazy load model (first Whisper job only; reused afterwards)
+            self.load()
 
             logger.info(f"Transcribing with Whisper: {audio_path}")
             segments_iter, info = self._whisper_model_instance.transcribe(
                 audio_path,
-                beam_size=5,
+                beam_size=self.beam_size,
                 word_timestamps=False,
-                vad_filter=True,
+                vad_filter=self.vad_filter,
             )
 
             segments = []
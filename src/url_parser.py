@@ -3,26 +3,64 @@
 import logging
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlparse, parse_qs
 
 logger = logging.getLogger(__name__)
 
-# Regex patterns for YouTube URLs
-YOUTUBE_PATTERNS = [
-    # Standard watch URLs: youtube.com/watch?v=VIDEO_ID
-    r"(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})",
-    # Short URLs: youtu.be/VIDEO_ID
-    r"(?:https?://)?youtu\.be/([a-zA-Z0-9_-]{11})",
-    # Embed URLs: youtube.com/embed/VIDEO_ID
-    r"(?:https?://)?(?:www\.)?youtube\.com/embed/([a-zA-Z0-9_-]{11})",
-    # Shorts URLs: youtube.com/shorts/VIDEO_ID
-    r"(?:https?://)?(?:www\.)?youtube\.com/shorts/([a-zA-Z0-9_-]{11})",
-    # Live URLs: youtube.com/live/VIDEO_ID
-    r"(?:https?://)?(?:www\.)?youtube\.com/live/([a-zA-Z0-9_-]{11})",
-    # Mobile URLs: m.youtube.com/watch?v=VIDEO_ID
-    r"(?:https?://)?m\.youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})",
-]
+# Every supported YouTube URL form in one alternation, so a URL is scanned
+# once instead of once per form: watch?v= (www. or m.), youtu.be, embed,
+# shorts and live
+YOUTUBE_URL_RE = re.compile(
+    r"(?:https?://)?"
+    r"(?:(?:www\.|m\.)?youtube\.com/(?:watch\?v=|embed/|shorts/|live/)|youtu\.be/)"
+    r"(?P<id>[a-zA-Z0-9_-]{11})"
+)
+
+# A URL embedded in a longer job file line, e.g. "URL: https://..."
+EMBEDDED_URL_RE = re.compile(r"https?://\S+")
+
+
+@lru_cache(maxsize=1024)
+def _extract_video_id(url: str) -> Optional[str]:
+    """Extract YouTube video ID from various URL formats (memoized).
+
+    The same URL is usually looked up several times per job (validate,
+    normalize, download), so results are cached.
+
+    Args:
+        url: YouTube URL in any supported format
+
+    Returns:
+        Video ID (11 characters) or None if not found
+    """
+    url = url.strip()
+
+    match = YOUTUBE_URL_RE.search(url)
+    if match:
+        video_id = match.group("id")
+        logger.debug(f"Extracted video ID: {video_id} from {url}")
+        return video_id
+
+    # Fallback: try parsing URL parameters. Only worth building a
+    # ParseResult and query dict when the host could be YouTube at all.
+    if "youtube" in url or "youtu.be" in url:
+        try:
+            parsed = urlparse(url)
+            if "youtube.com" in parsed.netloc or "youtu.be" in parsed.netloc:
+                # Check query parameters for 'v'
+                params = parse_qs(parsed.query)
+                if "v" in params and params["v"]:
+                    video_id = params["v"][0]
+                    if len(video_id) == 11:
+                        logger.debug(f"Extracted video ID from params: {video_id}")
+                        return video_id
+        except Exception as e:
+            logger.debug(f"URL parsing fallback failed: {e}")
+
+    logger.warning(f"Could not extract video ID from URL: {url}")
+    return None
 
 
 @dataclass
@@ -50,32 +88,7 @@ class URLParser:
         Returns:
             Video ID (11 characters) or None if not found
         """
-        url = url.strip()
-
-        # Try each pattern
-        for pattern in YOUTUBE_PATTERNS:
-            match = re.search(pattern, url)
-            if match:
-                video_id = match.group(1)
-                logger.debug(f"Extracted video ID: {video_id} from {url}")
-                return video_id
-
-        # Fallback: try parsing URL parameters
-        try:
-            parsed = urlparse(url)
-            if "youtube.com" in parsed.netloc or "youtu.be" in parsed.netloc:
-                # Check query parameters for 'v'
-                params = parse_qs(parsed.query)
-                if "v" in params and params["v"]:
-                    video_id = params["v"][0]
-                    if len(video_id) == 11:
-                        logger.debug(f"Extracted video ID from params: {video_id}")
-                        return video_id
-        except Exception as e:
-            logger.debug(f"URL parsing fallback failed: {e}")
-
-        logger.warning(f"Could not extract video ID from URL: {url}")
-        return None
+        return _extract_video_id(url)
 
     @staticmethod
     def is_valid_youtube_url(url: str) -> bool:
@@ -87,8 +100,7 @@ class URLParser:
         Returns:
             True if valid YouTube URL
         """
-        video_id = URLParser.extract_video_id(url)
-        return video_id is not None
+        return _extract_video_id(url) is not None
 
     @staticmethod
     def normalize_url(url: str) -> Optional[str]:
@@ -100,7 +112,7 @@ class URLParser:
         Returns:
             Normalized URL (https://www.youtube.com/watch?v=VIDEO_ID) or None
         """
-        video_id = URLParser.extract_video_id(url)
+        video_id = _extract_video_id(url)
         if video_id:
             return f"https://www.youtube.com/watch?v={video_id}"
         return None
@@ -130,15 +142,17 @@ class URLParser:
                 continue
 
             # Check if this line contains a YouTube URL
-            if URLParser.is_valid_youtube_url(line):
-                return URLParser.normalize_url(line)
-
-            # Try to find URL within the line (e.g., "URL: https://...")
-            url_match = re.search(r"https?://[^\s]+", line)
-            if url_match:
-                potential_url = url_match.group(0)
-                if URLParser.is_valid_youtube_url(potential_url):
-                    return URLParser.normalize_url(potential_url)
+            normalized = URLParser.normalize_url(line)
+            if normalized:
+                return normalized
+
+            # Try to find URL within the line (e.g., "URL: https://...").
+            # A line that is the URL itself was fully checked above.
+            url_match = EMBEDDED_URL_RE.search(line)
+            if url_match and url_match.group(0) != line:
+                normalized = URLParser.normalize_url(url_match.group(0))
+                if normalized:
+                    return normalized
 
         logger.warning("No valid YouTube URL found in job file content")
         return None